@@ -1,18 +1,64 @@
 import os
 import json
+import orjson
+import time
 import asyncio
 import socket
 import random
+import threading
+import dataclasses
 from typing import Optional, List, Dict, Any, Tuple, Callable, TypeVar
-from dotenv import load_dotenv
+import httpx
 from supabase import create_client, Client
+from supabase.client import ClientOptions
+from utils.env import load_env
 from utils.logger import handle_error, log
 
-# ============================================================================  
-# 설정 및 초기화  
-# ============================================================================  
+# ============================================================================
+# 설정 및 초기화
+# ============================================================================
 T = TypeVar("T")
 
+# 전역 Random의 락 경합을 피하기 위한 모듈 전용 RNG
+_RNG = random.Random(os.getpid())
+
+
+class _TTLCache:
+    """간단한 인메모리 TTL 캐시 (변경이 드문 조회 결과 메모이즈용)"""
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 60.0):
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._data: Dict[Any, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key: Any, value: Any) -> None:
+        with self._lock:
+            if len(self._data) >= self._maxsize:
+                # 만료된 항목 우선 정리, 그래도 가득 차면 전체 비움 (단순 정책)
+                now = time.monotonic()
+                self._data = {k: v for k, v in self._data.items() if v[0] >= now}
+                if len(self._data) >= self._maxsize:
+                    self._data.clear()
+            self._data[key] = (time.monotonic() + self._ttl, value)
+
+
+# 사용자/에이전트/폼 정보는 변경이 드물어 짧은 TTL로 캐시한다
+_participant_cache = _TTLCache(maxsize=10_000, ttl=60.0)
+# 폼 정의는 정규화 결과까지 캐시 (변경 빈도가 더 낮아 TTL을 길게)
+_form_cache = _TTLCache(maxsize=1_024, ttl=300.0)
+
 async def _async_retry(fn: Callable[[], T], *, name: str, retries: int = 3, base_delay: float = 0.8) -> Optional[T]:
     """동기 함수를 감싼 재시도 유틸 (지수 백오프 + 지터, 비치명)"""
     last_err: Optional[Exception] = None
@@ -21,7 +67,7 @@ async def _async_retry(fn: Callable[[], T], *, name: str, retries: int = 3, base
             return fn()
         except Exception as e:
             last_err = e
-            jitter = random.uniform(0, 0.3)
+            jitter = _RNG.random() * 0.3
             delay = base_delay * (2 ** (attempt - 1)) + jitter
             # 재시도 중에는 로그만 - 비치명적
             handle_error(f"{name} 재시도 {attempt}/{retries}", e, raise_error=False, extra={"delay": round(delay, 2)})
@@ -30,11 +76,14 @@ async def _async_retry(fn: Callable[[], T], *, name: str, retries: int = 3, base
     return None
 
 
-load_dotenv()
+load_env()
 _db_client: Client | None = None
 
+# 폴링마다 syscall을 반복하지 않도록 모듈 로드 시 한 번만 해석
+CONSUMER_ID = socket.gethostname()
+
 def initialize_db() -> None:
-    """Supabase 클라이언트 초기화"""
+    """Supabase 클라이언트 초기화 (keep-alive 커넥션 풀 설정 포함)"""
     global _db_client
     if _db_client is not None:
         return
@@ -42,7 +91,21 @@ def initialize_db() -> None:
     key = os.getenv("SUPABASE_KEY")
     if not url or not key:
         raise RuntimeError("SUPABASE_URL/KEY 설정 필요")
-    _db_client = create_client(url, key)
+    options = ClientOptions(postgrest_client_timeout=10, storage_client_timeout=10)
+    try:
+        # 폴링/이벤트 발행이 잦으므로 keep-alive 풀을 키워 TLS 핸드셰이크를 재사용
+        http_client = httpx.Client(
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            timeout=10,
+        )
+        _db_client = create_client(url, key, options=ClientOptions(
+            postgrest_client_timeout=10,
+            storage_client_timeout=10,
+            httpx_client=http_client,
+        ))
+    except TypeError:
+        # 설치된 supabase 버전이 커스텀 httpx 클라이언트 주입을 지원하지 않는 경우
+        _db_client = create_client(url, key, options=options)
 
 def get_db_client() -> Client:
     """DB 클라이언트 반환"""
@@ -51,6 +114,60 @@ def get_db_client() -> Client:
     return _db_client
 
 
+# ============================================================================
+# PostgREST 비동기 호출 (스레드풀 경유 없이 이벤트 루프에서 직접 수행)
+# ============================================================================
+
+_async_http: httpx.AsyncClient | None = None
+
+def _get_async_http() -> httpx.AsyncClient:
+    """PostgREST용 공유 AsyncClient 반환 (지연 생성)"""
+    global _async_http
+    if _async_http is None:
+        url = os.getenv("SUPABASE_URL")
+        key = os.getenv("SUPABASE_KEY")
+        if not url or not key:
+            raise RuntimeError("SUPABASE_URL/KEY 설정 필요")
+        _async_http = httpx.AsyncClient(
+            base_url=f"{url.rstrip('/')}/rest/v1",
+            headers={
+                "apikey": key,
+                "Authorization": f"Bearer {key}",
+                "Content-Type": "application/json",
+            },
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            timeout=10,
+        )
+    return _async_http
+
+async def _rest_select(table: str, select: str, filters: Dict[str, str]) -> List[Dict[str, Any]]:
+    """PostgREST 테이블 SELECT (비동기)"""
+    params = {'select': select, **filters}
+    resp = await _get_async_http().get(f"/{table}", params=params)
+    resp.raise_for_status()
+    return resp.json() or []
+
+async def _rest_insert(table: str, rows: List[Dict[str, Any]]) -> None:
+    """PostgREST 테이블 INSERT (비동기, 다중 행 일괄)"""
+    resp = await _get_async_http().post(
+        f"/{table}",
+        content=orjson.dumps(rows),
+        headers={"Prefer": "return=minimal"},
+    )
+    resp.raise_for_status()
+
+async def _rest_rpc(name: str, payload: Dict[str, Any]) -> Any:
+    """PostgREST RPC 호출 (비동기, orjson 직렬화)"""
+    resp = await _get_async_http().post(f"/rpc/{name}", content=orjson.dumps(payload))
+    resp.raise_for_status()
+    return orjson.loads(resp.content) if resp.content else None
+
+def _in_filter(values: List[str]) -> str:
+    """PostgREST `in.(...)` 필터 문자열 생성"""
+    quoted = ','.join('"' + v.replace('"', '\\"') + '"' for v in values)
+    return f"in.({quoted})"
+
+
 # ============================================================================  
 # 작업 조회 및 상태 관리  
 # ============================================================================  
@@ -59,7 +176,7 @@ async def fetch_pending_task(limit: int = 1) -> Optional[Dict[str, Any]]:
     """대기중인 작업 조회"""
     try:
         supabase = get_db_client()
-        consumer_id = socket.gethostname()
+        consumer_id = CONSUMER_ID
         env = (os.getenv("ENV") or "").lower()
 
         def _call():
@@ -123,13 +240,9 @@ async def fetch_done_data(proc_inst_id: Optional[str]) -> List[Any]:
                 {'p_proc_inst_id': proc_inst_id}
             ).execute()
         resp = await _async_retry(_call, name="완료데이터조회")
-        outputs: List[Any] = []
         if not resp:
-            return outputs
-        for row in resp.data or []:
-            if 'output' in row:
-                outputs.append(row.get('output'))
-        return outputs
+            return []
+        return [row['output'] for row in resp.data or [] if 'output' in row]
     except Exception as e:
         # 폴링에서 호출되므로 비치명적 처리
         handle_error("완료데이터조회", e, raise_error=True)
@@ -139,66 +252,81 @@ async def fetch_done_data(proc_inst_id: Optional[str]) -> List[Any]:
 # 사용자 및 에이전트 정보 조회
 # ============================================================================
 async def fetch_participants_info(agent_ids: str) -> tuple[List[Dict], List[Dict]]:
-    """사용자 또는 에이전트 정보 조회"""
-    def _sync():
-        try:
-            id_list = [id.strip() for id in agent_ids.split(',') if id.strip()]
-            
-            user_info_list = []
-            agent_info_list = []
-            
-            for agent_id in id_list:
-                # 이메일로 사용자 조회
-                user_data = _get_user_by_email(agent_id)
-                if user_data:
-                    user_info_list.append(user_data)
-                    continue
-                    
-                # ID로 에이전트 조회
-                agent_data = _get_agent_by_id(agent_id)
-                if agent_data:
-                    agent_info_list.append(agent_data)
-            
-            return user_info_list, agent_info_list
-            
-        except Exception as e:
-            handle_error("참가자정보오류", e, raise_error=True)
-            
-    return await asyncio.to_thread(_sync)
-
-def _get_user_by_email(agent_id: str) -> Optional[Dict]:
-    """이메일로 사용자 조회"""
-    supabase = get_db_client()
-    resp = supabase.table('users').select('id, email, username').eq('email', agent_id).execute()
-    if resp.data:
-        user = resp.data[0]
-        return {
-            'email': user.get('email'),
-            'name': user.get('username'),
-            'tenant_id': user.get('tenant_id')
-        }
-    return None
+    """사용자 또는 에이전트 정보 조회 (IN 쿼리로 일괄 조회, 비동기)"""
+    try:
+        id_list = [id.strip() for id in agent_ids.split(',') if id.strip()]
 
-def _get_agent_by_id(agent_id: str) -> Optional[Dict[str, Any]]:
-    """ID로 에이전트 조회"""
-    supabase = get_db_client()
-    resp = supabase.table('users').select(
-        'id, username, role, goal, persona, tools, profile, is_agent, model, tenant_id'
-    ).eq('id', agent_id).execute()
-    if resp.data and resp.data[0].get('is_agent'):
-        agent = resp.data[0]
-        return {
-            'id': agent.get('id'),
-            'name': agent.get('username'),
-            'role': agent.get('role'),
-            'goal': agent.get('goal'),
-            'persona': agent.get('persona'),
-            'tools': agent.get('tools'),
-            'profile': agent.get('profile'),
-            'model': agent.get('model'),
-            'tenant_id': agent.get('tenant_id')
-        }
-    return None
+        user_info_list = []
+        agent_info_list = []
+
+        # 캐시 적중분 먼저 분류
+        remaining = []
+        for agent_id in id_list:
+            cached = _participant_cache.get(('user', agent_id))
+            if cached is not None:
+                user_info_list.append(cached)
+                continue
+            cached = _participant_cache.get(('agent', agent_id))
+            if cached is not None:
+                agent_info_list.append(cached)
+                continue
+            remaining.append(agent_id)
+
+        if remaining:
+            # 이메일 일치분을 한 번의 IN 쿼리로 조회
+            users = await _rest_select(
+                'users',
+                'id,email,username,tenant_id',
+                {'email': _in_filter(remaining)},
+            )
+            found_emails = set()
+            for user in users:
+                info = _shape_user_info(user)
+                _participant_cache.set(('user', user.get('email')), info)
+                user_info_list.append(info)
+                found_emails.add(user.get('email'))
+
+            # 나머지는 ID 일치 에이전트를 한 번의 IN 쿼리로 조회
+            leftover = [i for i in remaining if i not in found_emails]
+            if leftover:
+                agents = await _rest_select(
+                    'users',
+                    'id,username,role,goal,persona,tools,profile,is_agent,model,tenant_id',
+                    {'id': _in_filter(leftover)},
+                )
+                for agent in agents:
+                    if not agent.get('is_agent'):
+                        continue
+                    info = _shape_agent_info(agent)
+                    _participant_cache.set(('agent', agent.get('id')), info)
+                    agent_info_list.append(info)
+
+        return user_info_list, agent_info_list
+
+    except Exception as e:
+        handle_error("참가자정보오류", e, raise_error=True)
+
+def _shape_user_info(user: Dict[str, Any]) -> Dict[str, Any]:
+    """users 행을 사용자 정보 dict로 변환"""
+    return {
+        'email': user.get('email'),
+        'name': user.get('username'),
+        'tenant_id': user.get('tenant_id')
+    }
+
+def _shape_agent_info(agent: Dict[str, Any]) -> Dict[str, Any]:
+    """users 행을 에이전트 정보 dict로 변환"""
+    return {
+        'id': agent.get('id'),
+        'name': agent.get('username'),
+        'role': agent.get('role'),
+        'goal': agent.get('goal'),
+        'persona': agent.get('persona'),
+        'tools': agent.get('tools'),
+        'profile': agent.get('profile'),
+        'model': agent.get('model'),
+        'tenant_id': agent.get('tenant_id')
+    }
 
 # ============================================================================
 # 작업 상태 업데이트 (완료/오류)
@@ -241,54 +369,95 @@ async def update_task_error(todo_id: str) -> None:
 # 폼 타입 조회 (Supabase)
 # ============================================================================
 
+def _normalize_form_row(form_id: str, row: Dict[str, Any]) -> Tuple[str, List[Dict], str]:
+    """form_def 행을 (form_id, form_types, form_html)로 정규화"""
+    fields_json = row.get('fields_json')
+    form_html = row.get('html') or ""
+    if not fields_json:
+        return form_id, [{'key': form_id, 'type': 'default', 'text': ''}], form_html
+    return form_id, fields_json, form_html
+
 async def fetch_form_types(tool_val: str, tenant_id: str) -> Tuple[str, List[Dict], str]:
-    """폼 타입 정보 조회 및 정규화 - form_id, form_types, form_html 함께 반환"""
-    def _sync():
-        try:
-            supabase = get_db_client()
-            form_id = tool_val[12:] if tool_val.startswith('formHandler:') else tool_val
-            
-            resp = (
-                supabase
-                .table('form_def')
-                .select('fields_json, html')
-                .eq('id', form_id)
-                .eq('tenant_id', tenant_id)
-                .execute()
-            )
-            log(f'✅ 폼 타입 조회 완료: {resp}')
-            fields_json = resp.data[0].get('fields_json') if resp.data else None
-            form_html = resp.data[0].get('html') if resp.data else ""
-            log(f'✅ 폼 필드 JSON: {fields_json}')
-            if not fields_json:
-                return form_id, [{'key': form_id, 'type': 'default', 'text': ''}], (form_html or "")
-
-            return form_id, fields_json, (form_html or "")
-            
-        except Exception as e:
-            handle_error("폼타입조회", e, raise_error=True)
-            
-    return await asyncio.to_thread(_sync)
+    """폼 타입 정보 조회 및 정규화 - form_id, form_types, form_html 함께 반환 (비동기)"""
+    try:
+        form_id = tool_val.removeprefix('formHandler:')
+
+        # 네트워크 IO와 정규화 루프를 모두 건너뛰도록 정규화 결과를 캐시
+        cached = _form_cache.get((form_id, tenant_id))
+        if cached is not None:
+            return cached
+
+        rows = await _rest_select(
+            'form_def',
+            'fields_json,html',
+            {'id': f'eq.{form_id}', 'tenant_id': f'eq.{tenant_id}'},
+        )
+        log(f'✅ 폼 타입 조회 완료: {rows}')
+        row = rows[0] if rows else {}
+        log(f'✅ 폼 필드 JSON: {row.get("fields_json")}')
+        result = _normalize_form_row(form_id, row)
+        if row:
+            _form_cache.set((form_id, tenant_id), result)
+        return result
+
+    except Exception as e:
+        handle_error("폼타입조회", e, raise_error=True)
+
+# ============================================================================
+# 작업 준비 컨텍스트 일괄 조회
+# ============================================================================
+
+async def fetch_task_context(proc_inst_id: Optional[str], user_ids: List[str], tool_val: str, tenant_id: str) -> Optional[Dict[str, Any]]:
+    """완료 데이터/참가자/폼 정의를 단일 RPC로 조회 (실패 시 None → 개별 조회로 폴백)"""
+    try:
+        form_id = tool_val.removeprefix('formHandler:')
+        data = await _rest_rpc(
+            'openai_deep_fetch_task_context',
+            {
+                'p_proc_inst_id': proc_inst_id,
+                'p_user_ids': user_ids,
+                'p_form_id': form_id,
+                'p_tenant_id': tenant_id,
+            },
+        )
+        if not isinstance(data, dict):
+            return None
+        proc_form_id, form_types, form_html = _normalize_form_row(form_id, data.get('form') or {})
+        return {
+            'done_outputs': data.get('done_outputs') or [],
+            'user_info': data.get('users') or [],
+            'proc_form_id': proc_form_id,
+            'form_types': form_types,
+            'form_html': form_html,
+        }
+    except Exception as e:
+        # RPC 미배포 등은 비치명 - 호출측이 개별 조회로 폴백
+        handle_error("컨텍스트일괄조회", e, raise_error=False)
+        return None
 
 # ============================================================================  
 # 결과 저장  
 # ============================================================================  
 
 async def save_task_result(todo_id: int, result: Any, final: bool = False) -> None:
-    """Supabase RPC로 작업 결과 저장 호출"""
-    def _sync():
-        try:
-            supabase = get_db_client()
-            payload = result if isinstance(result, (dict, list)) else json.loads(json.dumps(result))
-            supabase.rpc(
-                'save_task_result',
-                {
-                    'p_todo_id': todo_id,
-                    'p_payload': payload,
-                    'p_final':   final
-                }
-            ).execute()
-        except Exception as e:
-            handle_error("결과저장", e, raise_error=True)
-
-    await asyncio.to_thread(_sync)
\ No newline at end of file
+    """Supabase RPC로 작업 결과 저장 호출 (비동기)"""
+    try:
+        # RPC는 기본 타입을 그대로 받으므로 직렬화 왕복 없이 필요한 경우만 변환
+        if isinstance(result, (dict, list, str, int, float, bool)) or result is None:
+            payload = result
+        elif hasattr(result, 'model_dump'):
+            payload = result.model_dump()
+        elif dataclasses.is_dataclass(result):
+            payload = dataclasses.asdict(result)
+        else:
+            payload = orjson.loads(orjson.dumps(result, default=str))
+        await _rest_rpc(
+            'save_task_result',
+            {
+                'p_todo_id': todo_id,
+                'p_payload': payload,
+                'p_final':   final
+            }
+        )
+    except Exception as e:
+        handle_error("결과저장", e, raise_error=True)
\ No newline at end of file
@@ -1,22 +1,24 @@
 import asyncio
+import inspect
 import logging
-import json
+import orjson
 import os
 import sys
-import traceback
 from typing import Optional, Dict
 from research.prompt_executor import summarize_async
 from core.database import (
     initialize_db,
+    get_db_client,
     fetch_pending_task,
     fetch_done_data,
     fetch_task_status,
+    fetch_task_context,
     fetch_participants_info,
     fetch_form_types,
     update_task_completed,
     update_task_error
 )
-from utils.event_logger import EventLogger
+from utils.event_logger import get_event_logger
 from utils.logger import handle_error, log
 
 # ============================================================================
@@ -25,15 +27,26 @@ from utils.logger import handle_error, log
 
 logger = logging.getLogger(__name__)
 
-# 글로벌 상태
-current_todo_id: Optional[int] = None
-current_process: Optional[asyncio.subprocess.Process] = None
-worker_terminated_by_us: bool = False
+# 프로세스 수명 동안 불변이므로 임포트 시 한 번만 조회
+_OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+
+# 워커 실행 방식: inprocess(기본, 서브프로세스 기동/재임포트 비용 없음) | subprocess(격리 필요 시)
+WORKER_MODE = (os.getenv("WORKER_MODE") or "inprocess").lower()
+
+# 동시 처리 todo 상한 (1이면 기존과 동일한 순차 처리)
+MAX_CONCURRENT_TASKS = int(os.getenv("MAX_CONCURRENT_TASKS", "1"))
+
+# 실행 중인 작업 태스크들 (폴링 루프와 수명을 같이함)
+_running_tasks: set = set()
+
+# 실행 중인 워커 상태 (todo_id 문자열 → 워커 상태 dict, Realtime 취소 전달용)
+_active_workers: Dict[str, Dict] = {}
 
 def initialize_connections():
     """데이터베이스 연결 초기화"""
     try:
         initialize_db()
+        get_event_logger()
         log("✅ 연결 초기화 완료")
     except Exception as e:
         # 서버 기동 시 DB 초기화 실패는 fail-fast
@@ -46,37 +59,65 @@ def initialize_connections():
 # 작업 처리 메인 로직
 # ============================================================================
 
+def _new_worker_state(todo_id) -> Dict:
+    """작업 1건의 워커 실행 상태 (동시 처리를 위해 전역 대신 작업별로 보관)"""
+    return {
+        "todo_id": todo_id,
+        "process": None,      # subprocess 모드의 asyncio.subprocess.Process
+        "flow_task": None,    # inprocess 모드의 asyncio.Task
+        "terminated": False,  # 우리가 취소/종료시켰는지 여부
+    }
+
 async def process_new_task(row: Dict):
     """새 작업 처리"""
-    global current_process, worker_terminated_by_us, current_todo_id
-    
-    current_todo_id = row['id']
     todo_id = row['id']
     proc_inst_id = row.get('proc_inst_id')
-    
+    worker = _new_worker_state(todo_id)
+
+    _active_workers[str(todo_id)] = worker
     try:
         log(f"🆕 새 작업 처리 시작: id={todo_id}, proc_inst_id={proc_inst_id}")
         inputs = await _prepare_task_inputs(row)
-        await _execute_worker_process(inputs, todo_id)
+        if WORKER_MODE == "subprocess":
+            await _execute_worker_process(inputs, todo_id, worker)
+        else:
+            await _execute_worker_flow(inputs, todo_id, worker)
     except Exception as e:
         await update_task_error(todo_id)
         handle_error("작업준비실패", e, raise_error=True)
-        
     finally:
-        # 글로벌 상태 초기화
-        current_process = None
-        worker_terminated_by_us = False
-        current_todo_id = None
+        _active_workers.pop(str(todo_id), None)
 
 async def _prepare_task_inputs(row: Dict) -> Dict:
     """작업 입력 데이터 준비"""
     todo_id = row['id']
     proc_inst_id = row.get('proc_inst_id')
-    
+
+    # 완료 데이터/참가자/폼 정의를 단일 RPC로 일괄 조회 (실패 시 개별 조회로 폴백)
+    id_list = [i.strip() for i in (row.get('user_id') or '').split(',') if i.strip()]
+    context = await fetch_task_context(
+        proc_inst_id,
+        id_list,
+        row.get('tool', ''),
+        row['tenant_id']
+    )
+
     # 이전 컨텍스트 데이터 조회 (output만)
-    done_outputs = await fetch_done_data(proc_inst_id)
-    api_key = os.getenv("OPENAI_API_KEY")
-    
+    participants_task = None
+    form_task = None
+    if context is not None:
+        done_outputs = context['done_outputs']
+    else:
+        # 독립적인 조회들을 동시에 시작해 네트워크 지연을 겹치게 함
+        done_task = asyncio.create_task(fetch_done_data(proc_inst_id))
+        participants_task = asyncio.create_task(fetch_participants_info(row.get('user_id', '')))
+        form_task = asyncio.create_task(fetch_form_types(
+            tool_val=row.get('tool', ''),
+            tenant_id=row['tenant_id']
+        ))
+        done_outputs = await done_task
+    api_key = _OPENAI_API_KEY
+
     # 작업 타입에 따른 요약 처리
     if row.get('task_type') == 'FB_REQUESTED':
         current_feedback = row.get('feedback')
@@ -84,14 +125,17 @@ async def _prepare_task_inputs(row: Dict) -> Dict:
         output_summary, feedback_summary = await summarize_async(done_outputs, current_feedback, current_content, api_key)
     else:
         output_summary, feedback_summary = await summarize_async(done_outputs, None, None, api_key)
-    
-    # 사용자 및 폼 정보 조회
-    user_info_list, _ = await fetch_participants_info(row.get('user_id', ''))
-    proc_form_id, form_types, form_html = await fetch_form_types(
-        tool_val=row.get('tool', ''),
-        tenant_id=row['tenant_id']
-    )
-    
+
+    # 사용자 및 폼 정보 조회 (요약과 병렬로 이미 진행된 결과 수거)
+    if context is not None:
+        user_info_list = context['user_info']
+        proc_form_id = context['proc_form_id']
+        form_types = context['form_types']
+        form_html = context['form_html']
+    else:
+        user_info_list, _ = await participants_task
+        proc_form_id, form_types, form_html = await form_task
+
     return {
         "todo_id": todo_id,
         "proc_inst_id": proc_inst_id,
@@ -108,40 +152,86 @@ async def _prepare_task_inputs(row: Dict) -> Dict:
 # 워커 프로세스 관리
 # ============================================================================
 
-async def _execute_worker_process(inputs: Dict, todo_id: int):
-    """워커 프로세스 실행 및 관리"""
-    global current_process, worker_terminated_by_us
-    
+async def _execute_worker_flow(inputs: Dict, todo_id: int, worker: Dict):
+    """인프로세스 워커 실행 - 서브프로세스 기동과 모듈 재임포트, JSON 왕복 비용이 없음"""
+    try:
+        # 무거운 Flow 스택(crewai 등) 임포트를 실제 사용 시점까지 지연
+        from core.worker import main_async
+
+        worker["flow_task"] = asyncio.create_task(main_async(inputs))
+        watch_task = asyncio.create_task(_watch_cancel_status(worker))
+        log("✅ 인프로세스 워커 시작")
+
+        try:
+            await worker["flow_task"]
+        except asyncio.CancelledError:
+            if worker["terminated"]:
+                log("🛑 워커 사용자 중단됨 (인프로세스)")
+                return
+            raise
+        except Exception as e:
+            # 워커 실패는 해당 작업만 실패 - 비치명적(폴링 계속)
+            handle_error("워커오류", e, raise_error=False, extra={"todo_id": todo_id})
+            await update_task_error(todo_id)
+            return
+        finally:
+            if not watch_task.done():
+                watch_task.cancel()
+
+        get_event_logger().emit_event(
+            event_type="crew_completed",
+            data={},
+            job_id="CREW_FINISHED",
+            crew_type="crew",
+            todo_id=todo_id,
+            proc_inst_id=inputs.get("proc_inst_id")
+        )
+        log("✅ 인프로세스 워커 정상 종료")
+        await update_task_completed(todo_id)
+
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        await update_task_error(todo_id)
+        handle_error("워커실행실패", e, raise_error=True)
+
+async def _execute_worker_process(inputs: Dict, todo_id: int, worker: Dict):
+    """워커 프로세스 실행 및 관리 (WORKER_MODE=subprocess 전용)"""
     try:
         # 워커 프로세스 시작
-        worker_terminated_by_us = False
-        current_process = await asyncio.create_subprocess_exec(
+        process = await asyncio.create_subprocess_exec(
             sys.executable,
             os.path.join(os.path.dirname(__file__), "worker.py"),
-            "--inputs", json.dumps(inputs, ensure_ascii=False),
+            "--stdin",
+            stdin=asyncio.subprocess.PIPE,
         )
-        
+        worker["process"] = process
+
+        # argv 한도를 피해 큰 입력(form_html 등)을 stdin으로 전달
+        process.stdin.write(orjson.dumps(inputs))
+        await process.stdin.drain()
+        process.stdin.close()
+
         # 취소 상태 감시 및 워커 대기
-        watch_task = asyncio.create_task(_watch_cancel_status())
-        log(f"✅ 워커 시작 (PID={current_process.pid})")
-        
+        watch_task = asyncio.create_task(_watch_cancel_status(worker))
+        log(f"✅ 워커 시작 (PID={process.pid})")
+
         # 워커 프로세스 완료 대기
-        await current_process.wait()
+        await process.wait()
         if not watch_task.done():
             watch_task.cancel()
 
-        if worker_terminated_by_us:
-            log(f"🛑 워커 사용자 중단됨 (PID={current_process.pid})")
+        if worker["terminated"]:
+            log(f"🛑 워커 사용자 중단됨 (PID={process.pid})")
             return
 
-        if current_process.returncode != 0:
+        if process.returncode != 0:
             # 워커 비정상 종료는 해당 작업만 실패 - 비치명적(폴링 계속)
-            handle_error("워커비정상종료", Exception(f"returncode={current_process.returncode}"), raise_error=False, extra={"todo_id": todo_id})
+            handle_error("워커비정상종료", Exception(f"returncode={process.returncode}"), raise_error=False, extra={"todo_id": todo_id})
             await update_task_error(todo_id)
             return
 
-        ev_logger = EventLogger()
-        ev_logger.emit_event(
+        get_event_logger().emit_event(
             event_type="crew_completed",
             data={},
             job_id="CREW_FINISHED",
@@ -149,50 +239,58 @@ async def _execute_worker_process(inputs: Dict, todo_id: int):
             todo_id=todo_id,
             proc_inst_id=inputs.get("proc_inst_id")
         )
-        log(f"✅ 워커 정상 종료 (PID={current_process.pid})")
+        log(f"✅ 워커 정상 종료 (PID={process.pid})")
         await update_task_completed(todo_id)
-        
+
     except Exception as e:
         await update_task_error(todo_id)
         handle_error("워커실행실패", e, raise_error=True)
 
-def _log_worker_result():
-    """워커 종료 결과 로그"""
-    if worker_terminated_by_us:
-        log(f"🛑 워커 사용자 중단됨 (PID={current_process.pid})")
-    elif current_process.returncode != 0:  
-        log(f"❌ 워커 비정상 종료 (code={current_process.returncode})")
-    else:
-        log(f"✅ 워커 정상 종료 (PID={current_process.pid})")
+def _worker_running(worker: Dict) -> bool:
+    """해당 워커(서브프로세스 또는 인프로세스 태스크)가 실행 중인지"""
+    if worker["flow_task"] is not None:
+        return not worker["flow_task"].done()
+    process = worker["process"]
+    return process is not None and process.returncode is None
+
+async def _watch_cancel_status(worker: Dict, interval: int = 5, max_interval: int = 30):
+    """워커 취소 상태 감시 (Realtime 전달이 1차 경로, 이 폴링은 안전망)
 
-async def _watch_cancel_status():
-    """워커 취소 상태 감시"""
-    global current_todo_id, current_process, worker_terminated_by_us
-    
-    todo_id = current_todo_id
+    빠른 취소는 todolist Realtime 구독이 _notify_todolist_change에서
+    즉시 전달하므로, 여기서는 간격을 지수적으로 늘려 작업당 상태 조회
+    왕복을 줄인다.
+    """
+    todo_id = worker["todo_id"]
     if todo_id is None:
         return
-    
+
     # 주기적으로 취소 상태 확인
-    while current_process and current_process.returncode is None and not worker_terminated_by_us:
-        await asyncio.sleep(5)
+    delay = interval
+    while _worker_running(worker) and not worker["terminated"]:
+        await asyncio.sleep(delay)
+        delay = min(max_interval, delay * 2)
         try:
             draft_status = await fetch_task_status(todo_id)
             if draft_status in ('CANCELLED', 'FB_REQUESTED'):
                 log(f"🛑 draft_status={draft_status} 감지 (id={todo_id}) → 워커 종료")
-                terminate_current_worker()
+                _terminate_worker(worker)
                 break
         except Exception as e:
             handle_error("취소감시오류", e, raise_error=False)
 
-def terminate_current_worker():
-    """현재 실행 중인 워커 프로세스 종료"""
-    global current_process, worker_terminated_by_us
-    
-    if current_process and current_process.returncode is None:
-        worker_terminated_by_us = True
-        current_process.terminate()
-        log(f"✅ 워커 프로세스 종료 시그널 전송 (PID={current_process.pid})")
+def _terminate_worker(worker: Dict):
+    """해당 워커 종료 (인프로세스 태스크 취소 또는 서브프로세스 시그널)"""
+    flow_task = worker["flow_task"]
+    process = worker["process"]
+
+    if flow_task is not None and not flow_task.done():
+        worker["terminated"] = True
+        flow_task.cancel()
+        log("✅ 인프로세스 워커 취소 요청 전송")
+    elif process and process.returncode is None:
+        worker["terminated"] = True
+        process.terminate()
+        log(f"✅ 워커 프로세스 종료 시그널 전송 (PID={process.pid})")
     else:
         log("⚠️ 종료할 워커 프로세스가 없습니다.")
 
@@ -200,17 +298,115 @@ def terminate_current_worker():
 # 폴링 실행
 # ============================================================================
 
-async def start_todolist_polling(interval: int = 7):
-    """새 작업 처리 폴링 시작"""
-    log("🚀 TodoList 폴링 시작")
-    
+# Realtime 알림으로 폴링 루프를 깨우는 이벤트 (미구독 시에는 순수 폴링으로 동작)
+_wake_event: Optional[asyncio.Event] = None
+# 폴링 루프가 돌고 있는 이벤트 루프 (Realtime 콜백 스레드 → 루프 전달용)
+_poll_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def _extract_realtime_record(payload) -> Dict:
+    """Realtime 페이로드에서 변경된 row를 최대한 방어적으로 추출"""
+    if isinstance(payload, dict):
+        data = payload.get('data')
+        if isinstance(data, dict) and isinstance(data.get('record'), dict):
+            return data['record']
+        if isinstance(payload.get('record'), dict):
+            return payload['record']
+        return {}
+    record = getattr(payload, 'record', None)
+    return record if isinstance(record, dict) else {}
+
+def _notify_todolist_change(payload=None) -> None:
+    """todolist 변경 Realtime 콜백 - 대기 중인 폴링 루프를 즉시 깨움
+
+    Realtime 콜백은 supabase-py의 백그라운드 스레드에서 호출되고
+    asyncio.Event는 스레드 안전하지 않으므로(직접 set()하면 셀렉터가
+    깨어나지 않음) call_soon_threadsafe로 폴링 루프에 넘겨 실행한다.
+
+    event='*' 구독이라 UPDATE 페이로드에 draft_status가 실려 오므로,
+    실행 중인 작업의 취소/피드백 전환도 여기서 즉시 전달한다
+    (_watch_cancel_status 폴링은 안전망으로만 동작).
+    """
+    if _poll_loop is None:
+        return
+    if _wake_event is not None:
+        _poll_loop.call_soon_threadsafe(_wake_event.set)
+
+    try:
+        record = _extract_realtime_record(payload)
+        draft_status = record.get('draft_status')
+        if draft_status in ('CANCELLED', 'FB_REQUESTED'):
+            worker = _active_workers.get(str(record.get('id')))
+            if worker is not None and not worker["terminated"]:
+                log(f"🛑 draft_status={draft_status} Realtime 감지 (id={record.get('id')}) → 워커 종료")
+                _poll_loop.call_soon_threadsafe(_terminate_worker, worker)
+    except Exception as e:
+        # 취소 전달 실패는 비치명 - 감시 폴링이 안전망
+        handle_error("Realtime취소전달", e, raise_error=False)
+
+async def _subscribe_todolist_changes() -> None:
+    """todolist INSERT/UPDATE Realtime 구독 (실패는 비치명 - 폴링이 안전망)"""
+    try:
+        supabase = get_db_client()
+        channel = supabase.channel('todolist-changes')
+        channel.on_postgres_changes(
+            event='*',
+            schema='public',
+            table='todolist',
+            callback=_notify_todolist_change,
+        )
+        result = channel.subscribe()
+        if inspect.isawaitable(result):
+            await result
+        log("✅ todolist Realtime 구독 완료")
+    except Exception as e:
+        handle_error("Realtime구독", e, raise_error=False)
+
+async def _run_task_bounded(row: Dict, sem: asyncio.Semaphore):
+    """세마포어 슬롯을 점유한 채 작업 1건 실행 (실패는 비치명 - 폴링 계속)"""
+    try:
+        await process_new_task(row)
+    except Exception as e:
+        handle_error("작업처리오류", e, raise_error=False, extra={"todo_id": row.get('id')})
+    finally:
+        sem.release()
+
+async def start_todolist_polling(interval: int = 7, max_interval: int = 60):
+    """새 작업 처리 폴링 시작 (Realtime 알림 시 즉시 재폴링, 유휴 시 지수 백오프)
+
+    MAX_CONCURRENT_TASKS(기본 1)개까지 작업을 동시에 실행한다. 1이면
+    기존과 동일한 순차 처리 - 슬롯이 없으면 row를 선점하지 않고 대기한다.
+    """
+    global _wake_event, _poll_loop
+    _wake_event = asyncio.Event()
+    _poll_loop = asyncio.get_running_loop()
+    await _subscribe_todolist_changes()
+    sem = asyncio.Semaphore(MAX_CONCURRENT_TASKS)
+    log(f"🚀 TodoList 폴링 시작 (동시 처리 상한 {MAX_CONCURRENT_TASKS})")
+
+    delay = interval
     while True:
         try:
+            # 실행 슬롯을 먼저 확보한 뒤에만 row를 선점 (STARTED 마킹)
+            await sem.acquire()
             log("todolist 폴링 시도")
             row = await fetch_pending_task()
             if row:
-                await process_new_task(row)
+                task = asyncio.create_task(_run_task_bounded(row, sem))
+                _running_tasks.add(task)
+                task.add_done_callback(_running_tasks.discard)
+                delay = interval
+                continue  # 남은 슬롯이 있으면 바로 다음 작업 폴링
+            sem.release()
+            # 대기 작업이 없으면 폴링 간격을 점진적으로 늘려 유휴 DB 부하 절감
+            delay = min(max_interval, delay * 2)
         except Exception as e:
+            sem.release()
             handle_error("폴링오류", e, raise_error=False)
 
-        await asyncio.sleep(interval)
\ No newline at end of file
+        # 알림이 오면 interval을 다 기다리지 않고 즉시 다음 폴링 수행
+        try:
+            await asyncio.wait_for(_wake_event.wait(), timeout=delay)
+            delay = interval  # Realtime 알림 수신 시 기본 주기로 복귀
+        except asyncio.TimeoutError:
+            pass
+        _wake_event.clear()
\ No newline at end of file
@@ -12,37 +12,59 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(current_dir)  # core의 상위 디렉토리 (프로젝트 루트)
 sys.path.append(project_root)
 
-from flows.multi_format_flow import PromptMultiFormatFlow
-from core.database import initialize_db
-
 async def main_async(inputs: dict):
     """
     1) PromptMultiFormatFlow 인스턴스 생성
     2) inputs를 flow.state에 세팅
     3) kickoff_async 호출 (Flow 내부에서 중간·최종 결과 저장 및 DB 반영)
     """
+    # 무거운 스택(crewai/openai/supabase 등) 임포트를 실행 시점까지 지연
+    # → --help/인자 오류 경로가 1초대 임포트 비용 없이 즉시 끝남
+    from flows.multi_format_flow import PromptMultiFormatFlow
+    from core.database import initialize_db
+
     # DB 설정 초기화
     initialize_db()
     # Flow 실행 준비
     flow = PromptMultiFormatFlow()
-    for k, v in inputs.items():
-        setattr(flow.state, k, v)
+    # __dict__.update는 키마다 디스크립터/검증기를 태우는 setattr보다 빠름
+    # (상태 모델이 __dict__를 쓰지 않는 구현이면 기존 setattr 루프로 폴백)
+    try:
+        flow.state.__dict__.update(inputs)
+    except AttributeError:
+        for k, v in inputs.items():
+            setattr(flow.state, k, v)
 
     # Flow 실행 → 내부에서 save_context 및 DB 업데이트까지 처리
     await flow.kickoff_async()
 
 def main():
-    # 1) 커맨드라인 인자로 전달된 JSON 파싱
+    # 1) stdin 또는 커맨드라인 인자로 전달된 JSON 파싱
     parser = argparse.ArgumentParser(description="Run PromptMultiFormatFlow in a subprocess")
     parser.add_argument(
         "--inputs",
-        required=True,
+        required=False,
         help="JSON-encoded inputs for the flow (e.g. '{\"todo_id\":123, \"proc_inst_id\":\"abc\"}')"
     )
+    parser.add_argument(
+        "--stdin",
+        action="store_true",
+        help="Read JSON-encoded inputs from stdin (avoids argv size limits for large inputs)"
+    )
     args = parser.parse_args()
-    inputs = json.loads(args.inputs)
+    if args.stdin:
+        inputs = json.loads(sys.stdin.buffer.read().decode("utf-8"))
+    elif args.inputs:
+        inputs = json.loads(args.inputs)
+    else:
+        parser.error("--inputs 또는 --stdin 중 하나가 필요합니다")
 
-    # 2) 워커 실행
+    # 2) 워커 실행 (uvloop이 설치돼 있으면 기본 루프 대신 사용 - 선택 의존성)
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main_async(inputs))
 
 if __name__ == "__main__":
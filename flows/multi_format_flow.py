@@ -1,8 +1,11 @@
 import os
-import json
+import re
+import orjson
 import asyncio
+import hashlib
+from contextlib import asynccontextmanager
 from typing import Dict, List, Any, Optional
-from crewai.flow.flow import Flow, start, listen
+from crewai.flow.flow import Flow, start, listen, and_
 from pydantic import BaseModel, Field
 import uuid
 
@@ -14,19 +17,38 @@ from research.prompt_executor import (
 )
 from research.api_deep_research import execute_research_section
 from core.database import save_task_result
-from utils.event_logger import EventLogger
-from utils.logger import handle_error, log
+from utils.event_logger import get_event_logger
+from utils.logger import handle_error, log, debug_enabled
+
+# 프로세스 수명 동안 불변이므로 임포트 시 한 번만 조회
+_OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
 # ============================================================================
 # 유틸리티 함수
 # ============================================================================
 
+def _dumps_pretty(obj: Any) -> str:
+    """로그 출력용 JSON 직렬화 (orjson, 2-space 들여쓰기)"""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+# task_started 이벤트마다 반복되던 정적 에이전트 메타데이터 (한 곳에서만 정의)
+_AGENT_BASE = {
+    "name": "OpenAI Deep Research",
+    "agent_profile": "/images/chat-icon.png",
+}
+
+def _agent_task_data(goal: str, role: str) -> Dict[str, Any]:
+    """task_started 이벤트 data 구성 (정적 필드는 템플릿에서 병합)"""
+    return {**_AGENT_BASE, "goal": goal, "role": role}
+
+# ```json ... ``` 코드 블록 추출 패턴 (호출마다 재컴파일하지 않도록 모듈 스코프에 컴파일)
+_CODE_BLOCK_RE = re.compile(r"```(?:json)?[\r\n]+(.*?)[\r\n]+```", flags=re.DOTALL | re.IGNORECASE)
+
 def clean_json_response(raw_text: Any) -> str:
     """AI 응답에서 코드 블록 마크다운을 제거하여 순수 JSON만 추출"""
-    import re
     text = str(raw_text or "")
     # ```json ... ``` 패턴 제거
-    match = re.search(r"```(?:json)?[\r\n]+(.*?)[\r\n]+```", text, flags=re.DOTALL | re.IGNORECASE)
+    match = _CODE_BLOCK_RE.search(text)
     if match:
         return match.group(1)
     # 전체 코드 블록 제거
@@ -50,6 +72,19 @@ class ExecutionPlan(BaseModel):
     slide_phase: Phase = Field(default_factory=Phase)
     text_phase: Phase = Field(default_factory=Phase)
 
+    @classmethod
+    def from_plan_data(cls, plan_data: Dict[str, Any]) -> "ExecutionPlan":
+        """LLM이 생성한 계획 dict를 검증 없이 모델로 변환 (forms는 List[Dict]라 재검증이 불필요)"""
+        def _phase(name: str) -> Phase:
+            forms = (plan_data.get(name) or {}).get("forms") or []
+            return Phase.model_construct(forms=list(forms))
+
+        return cls.model_construct(
+            report_phase=_phase("report_phase"),
+            slide_phase=_phase("slide_phase"),
+            text_phase=_phase("text_phase"),
+        )
+
 class MultiFormatState(BaseModel):
     """프롬프트 기반 다중 포맷 플로우의 전체 상태를 관리하는 모델"""
     topic: str = ""
@@ -78,7 +113,43 @@ class PromptMultiFormatFlow(Flow[MultiFormatState]):
     
     def __init__(self):
         super().__init__()
-        self.event_logger = EventLogger()
+        self.event_logger = get_event_logger()
+        # 중간 저장용 완료 섹션 버퍼 (report_key -> 완료 순서대로 쌓인 섹션 본문)
+        self._merge_parts: Dict[str, List[str]] = {}
+        # 슬라이드 dependency 역인덱스 (report_key -> 해당 리포트에 의존하는 슬라이드 폼들)
+        self._slide_deps: Dict[str, List[Dict[str, Any]]] = {}
+        # 프롬프트 주입용 user_info 직렬화 결과 (플로우당 한 번만 수행)
+        self._user_info_json: Optional[str] = None
+
+    def _user_info_prompt(self) -> str:
+        """프롬프트에 넣을 user_info JSON 문자열 반환 (최초 호출 시 1회 직렬화)"""
+        if self._user_info_json is None:
+            self._user_info_json = orjson.dumps(self.state.user_info).decode()
+        return self._user_info_json
+
+    @asynccontextmanager
+    async def _stage_events(self, goal: str, role: str, job_id: str, crew_type: str):
+        """task_started/task_completed 이벤트 쌍 발행 공통화
+        with 블록이 stage["data"]에 완료 페이로드를 채우면 정상 종료 시 task_completed를 발행한다.
+        (예외 발생 시에는 기존 동작과 동일하게 완료 이벤트를 발행하지 않음)"""
+        self.event_logger.emit_event(
+            event_type="task_started",
+            data=_agent_task_data(goal, role),
+            job_id=job_id,
+            crew_type=crew_type,
+            todo_id=self.state.todo_id,
+            proc_inst_id=self.state.proc_inst_id
+        )
+        stage: Dict[str, Any] = {"data": {}}
+        yield stage
+        self.event_logger.emit_event(
+            event_type="task_completed",
+            data=stage["data"],
+            job_id=job_id,
+            crew_type=crew_type,
+            todo_id=self.state.todo_id,
+            proc_inst_id=self.state.proc_inst_id
+        )
 
     
 
@@ -90,59 +161,51 @@ class PromptMultiFormatFlow(Flow[MultiFormatState]):
     async def create_execution_plan(self) -> ExecutionPlan:
         """폼 타입을 분석하여 실행 계획을 생성 (시작점)"""
         try:
-            self.event_logger.emit_event(
-                event_type="task_started",
-                data={
-                    "goal": "다양한 폼 양식 유형을 분석하고 콘텐츠 생성 실행 계획을 작성합니다.",
-                    "name": "OpenAI Deep Research",
-                    "role": "다중 형식 분석을 통해 콘텐츠 생성 실행 계획을 작성하는 에이전트",
-                    "agent_profile": "/images/chat-icon.png"
-                },
+            async with self._stage_events(
+                "다양한 폼 양식 유형을 분석하고 콘텐츠 생성 실행 계획을 작성합니다.",
+                "다중 형식 분석을 통해 콘텐츠 생성 실행 계획을 작성하는 에이전트",
                 job_id="api-deep-research_planning_form",
-                crew_type="planning",
-                todo_id=self.state.todo_id,
-                proc_inst_id=self.state.proc_inst_id
-            )
-            
-            api_key = os.getenv("OPENAI_API_KEY")
-            plan_str = generate_execution_plan(self.state.form_types, self.state.user_info, api_key)
-            
-            # JSON 파싱 및 계획 저장 (로직은 execution_plan만 사용)
-            cleaned_text = clean_json_response(plan_str)
-            parsed = json.loads(cleaned_text)
-            plan_data = parsed.get("execution_plan", {})
-            explanation_text = parsed.get("explanation_text")
-            self.state.execution_plan = ExecutionPlan.parse_obj(plan_data)
-            
-            # 추가: 토픽, 유저 정보, 폼 타입 로그
-            log(f"🔖 토픽: {self.state.topic}")
-            log(f"👥 유저 정보:\n{json.dumps(self.state.user_info, indent=2, ensure_ascii=False)}")
-            log(f"📑 폼 타입:\n{json.dumps(self.state.form_types, indent=2, ensure_ascii=False)}")
-            if self.state.form_html:
-                log(f"🧩 폼 HTML 길이: {len(self.state.form_html)}")
-
-            # 추가: 실행 계획 상세 로그
-            log(f"🗒️ 실행 계획 상세:\n{json.dumps(plan_data, indent=2, ensure_ascii=False)}")
-
-            log(f"📋 실행 계획 생성 완료: 리포트 {len(self.state.execution_plan.report_phase.forms)}개, "
-                f"슬라이드 {len(self.state.execution_plan.slide_phase.forms)}개, "
-                f"텍스트 {len(self.state.execution_plan.text_phase.forms)}개")
-            
-            # 실행 계획 결과 이벤트에 explanation_text만 추가로 포함 (로직에는 미사용)
-            event_payload = {**plan_data}
-            if explanation_text:
-                event_payload = {"execution_plan": plan_data, "explanation_text": explanation_text}
-            else:
-                event_payload = {"execution_plan": plan_data}
+                crew_type="planning"
+            ) as stage:
+                api_key = _OPENAI_API_KEY
+                plan_str = await generate_execution_plan(
+                    self.state.form_types, self._user_info_prompt(), api_key
+                )
 
-            self.event_logger.emit_event(
-                event_type="task_completed",
-                data=event_payload,
-                job_id="api-deep-research_planning_form",
-                crew_type="planning",
-                todo_id=self.state.todo_id,
-                proc_inst_id=self.state.proc_inst_id
-            )
+                # JSON 파싱 및 계획 저장 (로직은 execution_plan만 사용)
+                cleaned_text = clean_json_response(plan_str)
+                parsed = orjson.loads(cleaned_text)
+                plan_data = parsed.get("execution_plan", {})
+                explanation_text = parsed.get("explanation_text")
+                self.state.execution_plan = ExecutionPlan.from_plan_data(plan_data)
+
+                # 리포트별 슬라이드 폼 조회가 O(R·F·D) 스캔이 되지 않도록 역인덱스를 한 번만 구성
+                self._slide_deps = {}
+                for slide_form in self.state.execution_plan.slide_phase.forms:
+                    for dep in slide_form.get('dependencies', []):
+                        self._slide_deps.setdefault(dep, []).append(slide_form)
+
+                # 추가: 토픽, 유저 정보, 폼 타입 로그 (상세 덤프는 DEBUG에서만 직렬화)
+                log(f"🔖 토픽: {self.state.topic}")
+                if debug_enabled():
+                    log(f"👥 유저 정보:\n{_dumps_pretty(self.state.user_info)}")
+                    log(f"📑 폼 타입:\n{_dumps_pretty(self.state.form_types)}")
+                if self.state.form_html:
+                    log(f"🧩 폼 HTML 길이: {len(self.state.form_html)}")
+
+                # 추가: 실행 계획 상세 로그
+                if debug_enabled():
+                    log(f"🗒️ 실행 계획 상세:\n{_dumps_pretty(plan_data)}")
+
+                log(f"📋 실행 계획 생성 완료: 리포트 {len(self.state.execution_plan.report_phase.forms)}개, "
+                    f"슬라이드 {len(self.state.execution_plan.slide_phase.forms)}개, "
+                    f"텍스트 {len(self.state.execution_plan.text_phase.forms)}개")
+
+                # 실행 계획 결과 이벤트에 explanation_text만 추가로 포함 (로직에는 미사용)
+                if explanation_text:
+                    stage["data"] = {"execution_plan": plan_data, "explanation_text": explanation_text}
+                else:
+                    stage["data"] = {"execution_plan": plan_data}
 
             return self.state.execution_plan
         except Exception as e:
@@ -160,67 +223,59 @@ class PromptMultiFormatFlow(Flow[MultiFormatState]):
             log("⚠️ 리포트 생성 계획이 없어 스킵합니다.")
             return {}
         try:
-            for report_form in self.state.execution_plan.report_phase.forms:
-                report_key = report_form.get('key', 'report')
-                
-                # TOC 생성
-                sections = await self._create_report_sections(report_key)
-                # 추가: TOC 목록 로그
-                log(f"🔍 [{report_key}] TOC 목록:\n{json.dumps(sections, indent=2, ensure_ascii=False)}")
-                self.state.report_sections[report_key] = sections
-                self.state.section_contents[report_key] = {}
-                
-                # 섹션별 콘텐츠 생성
-                await self._generate_section_contents(report_key, sections)
-                
-                # 섹션 병합
-                await self._merge_report_sections(report_key, sections)
-                
+            # 리포트 폼들은 서로 독립적이므로 동시에 처리
+            await asyncio.gather(*[
+                self._process_report_form(report_form)
+                for report_form in self.state.execution_plan.report_phase.forms
+            ])
             return self.state.report_contents
         except Exception as e:
             handle_error("리포트생성", e, raise_error=True)
 
+    async def _process_report_form(self, report_form: Dict[str, Any]) -> None:
+        """리포트 폼 하나 처리 (TOC 생성 → 섹션 생성 → 병합)"""
+        report_key = report_form.get('key', 'report')
+
+        # TOC 생성
+        sections = await self._create_report_sections(report_key)
+        # 추가: TOC 목록 로그
+        if debug_enabled():
+            log(f"🔍 [{report_key}] TOC 목록:\n{_dumps_pretty(sections)}")
+        self.state.report_sections[report_key] = sections
+        self.state.section_contents[report_key] = {}
+
+        # 섹션별 콘텐츠 생성
+        await self._generate_section_contents(report_key, sections)
+
+        # 섹션 병합
+        await self._merge_report_sections(report_key, sections)
+
     async def _create_report_sections(self, report_key: str) -> List[Dict[str, Any]]:
         """리포트의 TOC(목차) 생성"""
         try:
-            self.event_logger.emit_event(
-                event_type="task_started",
-                data={
-                    "goal": "컨텍스트를 분석하여, 현재 상황에 맞는 목차(TOC)를 생성합니다.",
-                    "name": "OpenAI Deep Research",
-                    "role": "컨텍스트를 분석하여, 현재 상황에 맞는 목차(TOC)를 생성하는 에이전트",
-                    "agent_profile": "/images/chat-icon.png"
-                },
+            async with self._stage_events(
+                "컨텍스트를 분석하여, 현재 상황에 맞는 목차(TOC)를 생성합니다.",
+                "컨텍스트를 분석하여, 현재 상황에 맞는 목차(TOC)를 생성하는 에이전트",
                 job_id=f"api-deep-research_planning_sections_{report_key}",
-                crew_type="planning",
-                todo_id=self.state.todo_id,
-                proc_inst_id=self.state.proc_inst_id
-            )
+                crew_type="planning"
+            ) as stage:
+                api_key = _OPENAI_API_KEY
+                toc_str = await generate_toc(
+                    self.state.previous_outputs, self.state.previous_feedback, self._user_info_prompt(), api_key
+                )
 
-            api_key = os.getenv("OPENAI_API_KEY")
-            toc_str = generate_toc(self.state.previous_outputs, self.state.previous_feedback, self.state.user_info, api_key)
-            
-            # JSON 파싱
-            cleaned_text = clean_json_response(toc_str)
-            toc_json = json.loads(cleaned_text)
-            sections = toc_json.get("toc", [])
-            explanation_text = toc_json.get("explanation_text")
-            
-            log(f"📋 [{report_key}] TOC 생성 완료: {len(sections)}개 섹션")
+                # JSON 파싱
+                cleaned_text = clean_json_response(toc_str)
+                toc_json = orjson.loads(cleaned_text)
+                sections = toc_json.get("toc", [])
+                explanation_text = toc_json.get("explanation_text")
 
-            # 이벤트에 explanation_text를 포함 (로직에는 미사용)
-            toc_event = {"toc": sections}
-            if explanation_text:
-                toc_event["explanation_text"] = explanation_text
+                log(f"📋 [{report_key}] TOC 생성 완료: {len(sections)}개 섹션")
 
-            self.event_logger.emit_event(
-                event_type="task_completed",
-                data=toc_event,
-                job_id=f"api-deep-research_planning_sections_{report_key}",
-                crew_type="planning",
-                todo_id=self.state.todo_id,
-                proc_inst_id=self.state.proc_inst_id
-            )
+                # 이벤트에 explanation_text를 포함 (로직에는 미사용)
+                stage["data"] = {"toc": sections}
+                if explanation_text:
+                    stage["data"]["explanation_text"] = explanation_text
 
             return sections
         except Exception as e:
@@ -230,130 +285,112 @@ class PromptMultiFormatFlow(Flow[MultiFormatState]):
 
     async def _generate_section_contents(self, report_key: str, sections: List[Dict[str, Any]]) -> None:
         """섹션별 내용을 병렬로 생성하고 완료 순서대로 처리"""
-        # 섹션별 비동기 작업 생성
+        # 섹션별 비동기 작업 생성 (title은 단계마다 재조회하지 않도록 한 번만 뽑아둠)
+        section_entries = [(sec.get('title', 'unknown'), sec) for sec in sections]
+
+        async def _run_section(title: str, section_job_id: str, sec: Dict[str, Any]):
+            """섹션 리서치 실행 - as_completed에서 어느 섹션인지 알 수 있도록 (title, job_id, 결과) 반환"""
+            try:
+                content = await execute_research_section(
+                    section_info=sec,
+                    topic=self.state.topic,
+                    previous_outputs=self.state.previous_outputs,
+                    previous_feedback=self.state.previous_feedback,
+                    event_logger=self.event_logger,
+                    todo_id=self.state.todo_id,
+                    proc_inst_id=self.state.proc_inst_id,
+                    job_id=f"api_{section_job_id}_{report_key}"
+                )
+                return title, section_job_id, content, None
+            except Exception as e:
+                return title, section_job_id, None, e
+
+        # 섹션별 고유 job_id 일괄 생성 (hex 포맷, 스케줄링 루프 밖에서 한 번에)
+        section_job_ids = [uuid.uuid4().hex for _ in section_entries]
+
         tasks = []
-        task_job_map = {}
-        section_map = {}
-        for sec in sections:
-            section_title = sec.get('title', 'unknown')
-            
-            # 섹션별 고유 job_id 생성
-            section_job_id = str(uuid.uuid4())
-            
+        for (section_title, sec), section_job_id in zip(section_entries, section_job_ids):
             # 섹션 시작 이벤트
             self.event_logger.emit_event(
                 event_type="task_started",
-                data={
-                    "goal": f"{section_title} 섹션의 내용을 생성하기 위해 리서치를 진행합니다.",
-                    "name": "OpenAI Deep Research",
-                    "role": "리서치를 진행하여 섹션의 내용을 생성하는 에이전트",
-                    "agent_profile": "/images/chat-icon.png"
-                },
+                data=_agent_task_data(
+                    f"{section_title} 섹션의 내용을 생성하기 위해 리서치를 진행합니다.",
+                    "리서치를 진행하여 섹션의 내용을 생성하는 에이전트"
+                ),
                 job_id=f"api_{section_job_id}_{report_key}",
                 crew_type="report",
                 todo_id=self.state.todo_id,
                 proc_inst_id=self.state.proc_inst_id
             )
-            
-            task = asyncio.create_task(
-                execute_research_section(
-                    section_info=sec,
-                    topic=self.state.topic, 
-                    previous_outputs=self.state.previous_outputs,
-                    previous_feedback=self.state.previous_feedback,
-                    event_logger=self.event_logger,
+
+            tasks.append(asyncio.create_task(_run_section(section_title, section_job_id, sec)))
+
+        # 완료 순서대로 처리 (asyncio.wait의 집합 재구성 없이 완료마다 O(1))
+        # 중간 저장은 매 완료가 아니라 약 1/4 지점마다 + 마지막에만 수행 (save_task_result 호출 수 절감)
+        save_every = max(1, len(tasks) // 4)
+        completed = 0
+        for next_done in asyncio.as_completed(tasks):
+            title, section_job_id, content, error = await next_done
+
+            if error is None:
+                self.state.section_contents[report_key][title] = content
+                self._merge_parts.setdefault(report_key, []).append(content)
+                log(f"✅ [{report_key}] 섹션 완료: {title}")
+                if debug_enabled():
+                    log(f"📄 [{report_key}] '{title}' 내용:\n{content}")
+
+                # 섹션 완료 이벤트
+                self.event_logger.emit_event(
+                    event_type="task_completed",
+                    data={report_key: content},
+                    job_id=f"api_{section_job_id}_{report_key}",
+                    crew_type="report",
                     todo_id=self.state.todo_id,
-                    proc_inst_id=self.state.proc_inst_id,
-                    job_id=f"api_{section_job_id}_{report_key}"
+                    proc_inst_id=self.state.proc_inst_id
                 )
-            )
-            tasks.append(task)
-            task_job_map[task] = section_job_id
-            section_map[task] = sec
-        
-        # 완료 순서대로 처리
-        pending_tasks = set(tasks)
-        
-        while pending_tasks:
-            done_tasks, pending_tasks = await asyncio.wait(pending_tasks, return_when=asyncio.FIRST_COMPLETED)
-            
-            for task in done_tasks:
-                section = section_map[task]
-                title = section.get('title', 'unknown')
-                
-                try:
-                    content = task.result()
-                    self.state.section_contents[report_key][title] = content
-                    log(f"✅ [{report_key}] 섹션 완료: {title}")
-                    log(f"📄 [{report_key}] '{title}' 내용:\n{content}")
-                    
-                    # 섹션 완료 이벤트
-                    self.event_logger.emit_event(
-                        event_type="task_completed",
-                        data={report_key: content},
-                        job_id=f"api_{task_job_map[task]}_{report_key}",
-                        crew_type="report",
-                        todo_id=self.state.todo_id,
-                        proc_inst_id=self.state.proc_inst_id
-                    )
-                    
-                except Exception as e:
-                    # 개별 섹션 실패는 오류 메시지로 대체 - 비치명적
-                    handle_error("섹션생성", e, raise_error=True, extra={"report_key": report_key, "title": title})
-                    self.state.section_contents[report_key][title] = f"섹션 생성 실패: {str(e)}"
-        
-                # 중간 결과 저장
+            else:
+                # 개별 섹션 실패는 오류 메시지로 대체 - 비치명적
+                handle_error("섹션생성", error, raise_error=True, extra={"report_key": report_key, "title": title})
+                self.state.section_contents[report_key][title] = f"섹션 생성 실패: {str(error)}"
+                self._merge_parts.setdefault(report_key, []).append(f"섹션 생성 실패: {str(error)}")
+
+            # 중간 결과 저장 (스로틀링)
+            completed += 1
+            if completed % save_every == 0 or completed == len(tasks):
                 await self._save_intermediate_result(report_key, sections)
 
     async def _merge_report_sections(self, report_key: str, sections: List[Dict[str, Any]]) -> None:
         """완성된 섹션들을 TOC 순서대로 병합"""
-        # 병합 시작 이벤트
-        self.event_logger.emit_event(
-            event_type="task_started",
-            data={
-                "goal": "리포트의 섹션들을 순서대로 병합하여, 최종 리포트를 생성합니다.",
-                "name": "OpenAI Deep Research",
-                "role": "병합된 섹션들을 TOC 순서대로 병합하는 에이전트",
-                "agent_profile": "/images/chat-icon.png"
-            },
-            job_id=f"api-deep-research_final_report_merge_{report_key}",
-            crew_type="report",
-            todo_id=self.state.todo_id,
-            proc_inst_id=self.state.proc_inst_id
-        )
-        
-        # TOC 순서 유지하여 병합
-        ordered_titles = [sec["title"] for sec in sections]
-        merged_content = "\n\n---\n\n".join([
-            self.state.section_contents[report_key][title]
-            for title in ordered_titles
-            if title in self.state.section_contents[report_key]
-        ])
-        
-        self.state.report_contents[report_key] = merged_content
-        log(f"📄 [{report_key}] 리포트 병합 완료: {len(merged_content)}자")
-        log(f"📑 [{report_key}] 최종 리포트 내용:\n{merged_content}")
-        
-        # 병합 완료 이벤트
-        self.event_logger.emit_event(
-            event_type="task_completed",
-            data={report_key: merged_content},
+        async with self._stage_events(
+            "리포트의 섹션들을 순서대로 병합하여, 최종 리포트를 생성합니다.",
+            "병합된 섹션들을 TOC 순서대로 병합하는 에이전트",
             job_id=f"api-deep-research_final_report_merge_{report_key}",
-            crew_type="report",
-            todo_id=self.state.todo_id,
-            proc_inst_id=self.state.proc_inst_id
-        )
+            crew_type="report"
+        ) as stage:
+            # TOC 순서 유지하여 병합 (state 속성/키 조회를 타이틀마다 반복하지 않도록 한 번만)
+            contents_map = self.state.section_contents[report_key]
+            merged_content = "\n\n---\n\n".join(
+                contents_map[sec["title"]] for sec in sections if sec["title"] in contents_map
+            )
+
+            self.state.report_contents[report_key] = merged_content
+            log(f"📄 [{report_key}] 리포트 병합 완료: {len(merged_content)}자")
+            if debug_enabled():
+                log(f"📑 [{report_key}] 최종 리포트 내용:\n{merged_content}")
+
+            # 병합 완료 이벤트 - 본문은 섹션 완료 이벤트로 이미 전송됐으므로 메타데이터만 싣는다
+            stage["data"] = {
+                "report_key": report_key,
+                "length": len(merged_content),
+                "sha256": hashlib.sha256(merged_content.encode("utf-8")).hexdigest(),
+            }
 
     async def _save_intermediate_result(self, report_key: str, sections: List[Dict[str, Any]]) -> None:
         """완성된 섹션들을 DB에 중간 저장"""
-        # 현재까지 완성된 섹션들만 병합
-        ordered_titles = [sec["title"] for sec in sections]
-        merged_content = "\n\n---\n\n".join([
-            self.state.section_contents[report_key][title]
-            for title in ordered_titles
-            if title in self.state.section_contents[report_key]
-        ])
-        
+        # 완료 순서대로 쌓아둔 버퍼를 한 번만 join (섹션 수 K에 대해 매번 재병합하던 O(K²) 제거)
+        # 최종 TOC 순서 병합은 _merge_report_sections에서 수행
+        merged_content = "\n\n---\n\n".join(self._merge_parts.get(report_key, []))
+
         self.state.report_contents[report_key] = merged_content
         
         # DB 저장
@@ -392,45 +429,51 @@ class PromptMultiFormatFlow(Flow[MultiFormatState]):
             handle_error("슬라이드생성", e, raise_error=True)
 
     async def _create_slides(self, content: str, report_key: str = None) -> None:
-        """통합 슬라이드 생성 함수 - 리포트 기반 또는 이전 결과물 기반"""
-        api_key = os.getenv("OPENAI_API_KEY")
-        
-        for slide_form in self.state.execution_plan.slide_phase.forms:
-            # 리포트 기반인 경우 dependency 체크
-            if report_key and report_key not in slide_form.get('dependencies', []):
-                continue
-                
+        """통합 슬라이드 생성 함수 - 리포트 기반 또는 이전 결과물 기반 (폼별 병렬 실행)"""
+        api_key = _OPENAI_API_KEY
+
+        # 대상 폼 수집 (리포트 기반인 경우 역인덱스로 조회)
+        if report_key:
+            target_forms = self._slide_deps.get(report_key, [])
+        else:
+            target_forms = self.state.execution_plan.slide_phase.forms
+        if not target_forms:
+            return
+
+        goal_text = f"리포트 내용을 기반으로 슬라이드를 생성합니다." if report_key else "이전 결과물을 기반으로 슬라이드를 생성합니다."
+        for slide_form in target_forms:
             slide_key = slide_form['key']
-            
             # 슬라이드 시작 이벤트
-            goal_text = f"리포트 내용을 기반으로 슬라이드를 생성합니다." if report_key else "이전 결과물을 기반으로 슬라이드를 생성합니다."
             self.event_logger.emit_event(
                 event_type="task_started",
-                data={
-                    "goal": goal_text,
-                    "name": "OpenAI Deep Research",
-                    "role": "내용을 기반으로 슬라이드를 생성하는 에이전트",
-                    "agent_profile": "/images/chat-icon.png"
-                },
+                data=_agent_task_data(
+                    goal_text,
+                    "내용을 기반으로 슬라이드를 생성하는 에이전트"
+                ),
                 job_id=f"api-deep-research_generate_slides_{slide_key}",
                 crew_type="slide",
                 todo_id=self.state.todo_id,
                 proc_inst_id=self.state.proc_inst_id
             )
-            
-            # 슬라이드 생성 (분리된 피드백 전달)
-            slide_content = generate_slide_from_report(
-                content, 
-                self.state.user_info, 
+
+        # 폼별 LLM 호출은 서로 독립적이므로 동시에 실행
+        slide_results = await asyncio.gather(*[
+            generate_slide_from_report(
+                content,
+                self._user_info_prompt(),
                 api_key,
                 previous_outputs_summary=self.state.previous_outputs,
                 feedback_summary=self.state.previous_feedback
             )
+            for _ in target_forms
+        ])
+
+        source_text = f"from {report_key}" if report_key else "from previous outputs"
+        for slide_form, slide_content in zip(target_forms, slide_results):
+            slide_key = slide_form['key']
             self.state.slide_contents[slide_key] = slide_content
-            
-            source_text = f"from {report_key}" if report_key else "from previous outputs"
             log(f"🎯 [{slide_key}] 슬라이드 생성 완료 ({source_text})")
-            
+
             # 슬라이드 완료 이벤트
             self.event_logger.emit_event(
                 event_type="task_completed",
@@ -445,78 +488,64 @@ class PromptMultiFormatFlow(Flow[MultiFormatState]):
     # 4단계: 텍스트 생성
     # ========================================================================
 
-    @listen("generate_slides")
+    @listen("generate_reports")
     async def generate_texts(self) -> Dict[str, Any]:
-        """텍스트 폼 생성 - 리포트 내용 또는 이전 결과물 기반"""
+        """텍스트 폼 생성 - 리포트 내용 또는 이전 결과물 기반 (슬라이드와 병렬 실행)"""
         # 텍스트 생성 계획이 없으면 스킵
         if not (self.state.execution_plan and self.state.execution_plan.text_phase.forms):
             log("⚠️ 텍스트 생성 계획이 없어 스킵합니다.")
             return {}
         try:
             log("▶️ 텍스트 생성 시작")
-            
-            # 텍스트 생성 시작 이벤트 (한 번만)
-            self.event_logger.emit_event(
-                event_type="task_started",
-                data={
-                    "goal": "모든 텍스트 폼 값을 생성합니다.",
-                    "name": "OpenAI Deep Research",
-                    "role": "내용을 기반으로 텍스트 폼 값들을 생성하는 에이전트",
-                    "agent_profile": "/images/chat-icon.png"
-                },
-                job_id="api-deep-research_generate_texts",
-                crew_type="text",
-                todo_id=self.state.todo_id,
-                proc_inst_id=self.state.proc_inst_id
-            )
-            
-            # content 결정: 리포트가 있으면 리포트, 없으면 이전 결과물
-            if self.state.report_contents:
-                content = self.state.report_contents  # 리포트 내용
-            else:
-                content = self.state.previous_outputs or ""  # 이전 결과물
-            
-            # 모든 매칭된 텍스트 폼들을 수집
-            matched_forms = []
-            for text_form in self.state.execution_plan.text_phase.forms:
-                text_key = text_form['key']
-                # 실행계획의 key에 해당하는 form_type만 필터링
-                target_form_type = [ft for ft in self.state.form_types if ft.get('key') == text_key]
-                if target_form_type:
-                    matched_forms.extend(target_form_type)
-            
-            # 매칭된 모든 폼을 한 번에 처리
-            if matched_forms:
-                await self._generate_all_text_content(content, matched_forms)
-            
-            # 텍스트 생성 완료 이벤트 (한 번만)
-            self.event_logger.emit_event(
-                event_type="task_completed",
-                data=self.state.text_contents,
+
+            # 텍스트 생성 시작/완료 이벤트 (한 번만)
+            async with self._stage_events(
+                "모든 텍스트 폼 값을 생성합니다.",
+                "내용을 기반으로 텍스트 폼 값들을 생성하는 에이전트",
                 job_id="api-deep-research_generate_texts",
-                crew_type="text",
-                todo_id=self.state.todo_id,
-                proc_inst_id=self.state.proc_inst_id
-            )
-                
+                crew_type="text"
+            ) as stage:
+                # content 결정: 리포트가 있으면 리포트, 없으면 이전 결과물
+                if self.state.report_contents:
+                    content = self.state.report_contents  # 리포트 내용
+                else:
+                    content = self.state.previous_outputs or ""  # 이전 결과물
+
+                # 모든 매칭된 텍스트 폼들을 수집 (form_types 전체 스캔 대신 key 인덱스 1회 구성)
+                form_by_key: Dict[str, List[Dict[str, Any]]] = {}
+                for ft in self.state.form_types:
+                    if 'key' in ft:
+                        form_by_key.setdefault(ft['key'], []).append(ft)
+
+                matched_forms = []
+                for text_form in self.state.execution_plan.text_phase.forms:
+                    # 실행계획의 key에 해당하는 form_type만 필터링
+                    matched_forms.extend(form_by_key.get(text_form['key'], []))
+
+                # 매칭된 모든 폼을 한 번에 처리
+                if matched_forms:
+                    await self._generate_all_text_content(content, matched_forms)
+
+                stage["data"] = self.state.text_contents
+
             log("✅ 텍스트 생성 완료")
             return self.state.text_contents
-            
+
         except Exception as e:
             handle_error("텍스트생성", e, raise_error=True)
 
     async def _generate_all_text_content(self, content: Any, matched_forms: List[Dict]) -> None:
         """모든 매칭된 텍스트 폼을 한 번에 처리"""
-        api_key = os.getenv("OPENAI_API_KEY")
+        api_key = _OPENAI_API_KEY
         
         log(f"📝 텍스트 폼 {len(matched_forms)}개 일괄 생성 중...")
 
         # 모든 매칭된 폼 정보를 한 번에 전달
-        result_text = generate_text_form_values(
+        result_text = await generate_text_form_values(
             content,
             self.state.topic,
             matched_forms,  # 모든 매칭된 폼 객체들
-            self.state.user_info,
+            self._user_info_prompt(),
             api_key,
             previous_outputs_summary=self.state.previous_outputs,
             feedback_summary=self.state.previous_feedback,
@@ -528,25 +557,29 @@ class PromptMultiFormatFlow(Flow[MultiFormatState]):
 
     async def _parse_all_text_results(self, raw_result: str) -> None:
         """모든 텍스트 결과를 파싱하여 저장"""
+        cleaned_result = clean_json_response(raw_result)
+        # JSON일 수 없는 일반 텍스트 응답은 파서/예외 경로를 거치지 않고 바로 저장
+        if not cleaned_result.lstrip().startswith(('{', '[')):
+            self.state.text_contents = {"text": str(raw_result)}
+            return
         try:
-            cleaned_result = clean_json_response(raw_result)
-            parsed_results = json.loads(cleaned_result)
+            parsed_results = orjson.loads(cleaned_result)
             # 전체 결과를 그대로 저장
             if isinstance(parsed_results, dict):
                 self.state.text_contents = parsed_results
             else:
                 self.state.text_contents = {"text": cleaned_result}
-                    
-        except json.JSONDecodeError:
+
+        except orjson.JSONDecodeError:
             self.state.text_contents = {"text": str(raw_result)}
 
     # ========================================================================
     # 5단계: 최종 저장
     # ========================================================================
 
-    @listen("generate_texts")
+    @listen(and_("generate_slides", "generate_texts"))
     async def save_final_results(self) -> None:
-        """모든 결과를 최종 저장하고 완료 이벤트 발행"""
+        """모든 결과를 최종 저장하고 완료 이벤트 발행 (슬라이드·텍스트 모두 끝난 뒤)"""
         try:
             log("\n" + "="*60)
             log("🎉 프롬프트 다중 포맷 생성 완료!")
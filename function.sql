@@ -206,4 +206,72 @@ $$ LANGUAGE plpgsql VOLATILE;
 
 
 -- 익명(anon) 역할에 실행 권한 부여
-GRANT EXECUTE ON FUNCTION public.openai_deep_fetch_pending_task(integer, text) TO anon;
\ No newline at end of file
+GRANT EXECUTE ON FUNCTION public.openai_deep_fetch_pending_task(integer, text) TO anon;
+
+-- 2) 작업 준비 컨텍스트 일괄 조회 (완료 데이터 + 참가자 + 폼 정의를 한 번의 RPC로)
+DROP FUNCTION IF EXISTS public.openai_deep_fetch_task_context(text, text[], text, text);
+
+CREATE OR REPLACE FUNCTION public.openai_deep_fetch_task_context(
+  p_proc_inst_id text,
+  p_user_ids     text[],
+  p_form_id      text,
+  p_tenant_id    text
+)
+RETURNS jsonb AS $$
+DECLARE
+  v_done_outputs jsonb := '[]'::jsonb;
+  v_users        jsonb := '[]'::jsonb;
+  v_form         jsonb := '{}'::jsonb;
+BEGIN
+  IF p_proc_inst_id IS NOT NULL THEN
+    SELECT COALESCE(jsonb_agg(d.output), '[]'::jsonb)
+      INTO v_done_outputs
+      FROM public.fetch_done_data(p_proc_inst_id) AS d;
+  END IF;
+
+  SELECT COALESCE(jsonb_agg(jsonb_build_object(
+           'email',     u.email,
+           'name',      u.username,
+           'tenant_id', u.tenant_id)), '[]'::jsonb)
+    INTO v_users
+    FROM users AS u
+   WHERE u.email = ANY(p_user_ids);
+
+  SELECT COALESCE(to_jsonb(f), '{}'::jsonb)
+    INTO v_form
+    FROM (
+      SELECT fields_json, html
+        FROM form_def
+       WHERE id = p_form_id
+         AND tenant_id = p_tenant_id
+       LIMIT 1
+    ) AS f;
+
+  RETURN jsonb_build_object(
+    'done_outputs', v_done_outputs,
+    'users',        v_users,
+    'form',         COALESCE(v_form, '{}'::jsonb)
+  );
+END;
+$$ LANGUAGE plpgsql VOLATILE;
+
+GRANT EXECUTE ON FUNCTION public.openai_deep_fetch_task_context(text, text[], text, text) TO anon;
+
+-- 3) 이벤트 배치 적재 (행 단위 PostgREST insert 오버헤드 우회)
+DROP FUNCTION IF EXISTS public.log_event_batch(jsonb);
+
+CREATE OR REPLACE FUNCTION public.log_event_batch(
+  records jsonb
+)
+RETURNS void AS $$
+BEGIN
+  -- 이벤트 로그는 마지막 수 ms 유실을 감수 가능 → WAL 동기 커밋 생략으로 쓰기 처리량 확보
+  SET LOCAL synchronous_commit = OFF;
+
+  INSERT INTO public.events
+  SELECT *
+    FROM jsonb_populate_recordset(null::public.events, records);
+END;
+$$ LANGUAGE plpgsql VOLATILE;
+
+GRANT EXECUTE ON FUNCTION public.log_event_batch(jsonb) TO anon;
@@ -4,36 +4,24 @@
 # 기본 환경 설정 및 인코딩 설정
 # ========================================
 import sys
-import io
 import os
-import builtins
 import warnings
 import asyncio
 from contextlib import asynccontextmanager
 sys.path.append(os.path.dirname(__file__))
-# UTF-8 인코딩 강제 설정
-sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
-sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+# UTF-8 인코딩 강제 설정 (스트림 재생성 없이 인코딩만 교체)
+# 줄단위 플러시는 print 오버라이드 대신 PYTHONUNBUFFERED=1(Dockerfile)로 처리
+sys.stdout.reconfigure(encoding='utf-8')
+sys.stderr.reconfigure(encoding='utf-8')
 os.environ["PYTHONIOENCODING"] = "utf-8"
 
-# 환경변수 로드
-from dotenv import load_dotenv
-load_dotenv()
+# 환경변수 로드 (프로세스당 1회)
+from utils.env import load_env
+load_env()
 
 # 현재 디렉토리를 Python 경로에 추가
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-# ========================================
-# 전역 print 함수 오버라이드
-# ========================================
-_orig_print = builtins.print
-def print(*args, **kwargs):
-    """기본적으로 flush=True를 적용한 print 함수"""
-    if 'flush' not in kwargs:
-        kwargs['flush'] = True
-    _orig_print(*args, **kwargs)
-builtins.print = print
-
 # ========================================
 # 로깅 설정
 # ========================================
@@ -1,19 +1,20 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-import json
+import orjson
 import os
 import sys
-from dotenv import load_dotenv
+import time
 from typing import Optional
+from utils.env import load_env
 from utils.event_logger import EventLogger
-from utils.logger import log
+from utils.logger import log, debug_enabled, handle_error
 import openai
 
 # UTF-8 강제 설정 (한글 깨짐 방지)
 sys.stdout.reconfigure(encoding='utf-8', line_buffering=True)
 sys.stderr.reconfigure(encoding='utf-8', line_buffering=True)
 
-load_dotenv()
+load_env()
 
 # 비동기 OpenAI 클라이언트 초기화
 client = openai.AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), timeout=600.0)
@@ -26,56 +27,17 @@ tools = [
 
 # 본문 출력 최소 단위
 CHAR_THRESHOLD = 1000
+# 본문 버퍼 최소 플러시 간격 (초) - 병렬 섹션이 많을 때 로그 호출이
+# 이벤트 루프에 몰리지 않도록 크기 조건에 시간 조건을 더함
+FLUSH_INTERVAL = 0.5
 
-async def execute_research_section(section_info: dict, topic: str = "", previous_outputs: str = "", previous_feedback: str = "", event_logger: Optional[EventLogger] = None, todo_id: Optional[str] = None, proc_inst_id: Optional[str] = None, job_id: Optional[str] = None):
-    """
-    개별 섹션에 대한 리서치를 실행하는 함수
-    
-    Args:
-        section_info: 섹션 정보 (number, title, subsections 등)
-        topic: 주제
-        previous_outputs: 이전 결과물 요약
-        previous_feedback: 피드백 요약
-        event_logger: EventLogger instance for logging events
-        todo_id: Todo ID for logging events
-        proc_inst_id: Process Instance ID for logging events
-        job_id: Job ID for logging events
-    
-    Returns:
-        str: 리서치 결과 텍스트
-    """
-    title = section_info.get("title", "섹션")
-    number = section_info.get("number", "")
-    subsections = section_info.get("subsections", [])
-    
-    log(f"\n=== 섹션 리서치 시작: {number}. {title} ===")
-    buffer = ""
-    full_text = ""
-
-    # 하위 섹션 정보 구성 (기존 로직 유지)
-    subsection_structure = ""
-    if subsections:
-        subsection_structure = "\n\n하위 섹션들:\n"
-        for sub in subsections:
-            sub_number = sub.get("number", "")
-            sub_title = sub.get("title", "")
-            subsection_structure += f"- {sub_number}. {sub_title}\n"
+# 스트림 끊김 시 이어받기 최대 횟수
+STREAM_RESUME_MAX = 5
 
-    # 적당한 수준의 상세 프롬프트
-    combined_prompt = f"""
-당신은 해당 분야의 전문가로서 섹션 '{title}'에 대한 전문적이고 심층적인 리서치 보고서를 작성해야 합니다.
-
-**📋 섹션 정보:**
-- 섹션 번호: {number}
-- 섹션 제목: {title}{subsection_structure}
-
-**🔍 컨텍스트 분석:**
-
-**이전 결과물 요약:**
-{previous_outputs}
-
-**피드백 요약:**
-{previous_feedback}
+# 섹션 리서치 프롬프트 템플릿 (모듈 로드 시 1회 구성; 섹션마다 수 KB f-string을
+# 재조립하는 대신 가변부만 format으로 치환)
+_SECTION_PROMPT_TEMPLATE = """
+당신은 해당 분야의 전문가로서 지정된 섹션에 대한 전문적이고 심층적인 리서치 보고서를 작성해야 합니다.
 
 **컨텍스트 분석 단계:**
 1. **이전 결과물 문맥 파악**: previous_outputs를 분석하여 이전에 무엇을 했는지, 어떤 목적과 요구사항이 있었는지 정확히 이해
@@ -88,7 +50,7 @@ async def execute_research_section(section_info: dict, topic: str = "", previous
 **📊 작업 지침:**
 
 **1. 섹션 역할 파악 및 맞춤 내용 작성**
-현재 섹션 '{title}'이 전체 보고서에서 담당하는 역할을 분석하고 그에 맞는 내용을 작성하세요:
+현재 섹션이 전체 보고서에서 담당하는 역할을 분석하고 그에 맞는 내용을 작성하세요:
 
 - **개요/서론/배경** → 주제 소개, 배경 설명, 연구 목적, 범위 정의
 - **이론/개념** → 핵심 개념 정의, 이론적 배경, 기본 원리, 연구 동향
@@ -127,15 +89,77 @@ async def execute_research_section(section_info: dict, topic: str = "", previous
 - **최소 호출**: 툴 호출 횟수를 최소화하고 꼭 필요한 정보만 검색 (최대 5회 이내)
 
 **⚠️ 필수 준수사항:**
-1. 섹션 '{title}'의 역할에 최적화된 전문적 내용 작성
+1. 현재 섹션의 역할에 최적화된 전문적 내용 작성
 2. 이전 컨텍스트의 피드백과 요구사항을 반드시 반영
 3. 해당 섹션만의 고유한 가치를 제공하는 차별화된 내용 구성
 4. 완성도 높은 보고서 (도구 호출을 최소화하고, 도구 결과 부족해도 창의적으로 문맥 파악하여 완성)
 5. 툴 사용 횟수 최소화 (최대 5회 이내)
 
 
+**📋 섹션 정보:**
+- 섹션 번호: {number}
+- 섹션 제목: {title}{subsection_structure}
+
+**🔍 컨텍스트 분석:**
+
+**이전 결과물 요약:**
+{previous_outputs}
+
+**피드백 요약:**
+{previous_feedback}
+
 위 지침에 따라 섹션 '{title}'에 대한 전문적이고 포괄적인 리서치 보고서를 작성해주세요.
-""".strip()
+"""
+
+
+async def execute_research_section(section_info: dict, topic: str = "", previous_outputs: str = "", previous_feedback: str = "", event_logger: Optional[EventLogger] = None, todo_id: Optional[str] = None, proc_inst_id: Optional[str] = None, job_id: Optional[str] = None):
+    """
+    개별 섹션에 대한 리서치를 실행하는 함수
+    
+    Args:
+        section_info: 섹션 정보 (number, title, subsections 등)
+        topic: 주제
+        previous_outputs: 이전 결과물 요약
+        previous_feedback: 피드백 요약
+        event_logger: EventLogger instance for logging events
+        todo_id: Todo ID for logging events
+        proc_inst_id: Process Instance ID for logging events
+        job_id: Job ID for logging events
+    
+    Returns:
+        str: 리서치 결과 텍스트
+    """
+    title = section_info.get("title", "섹션")
+    number = section_info.get("number", "")
+    subsections = section_info.get("subsections", [])
+    
+    log(f"\n=== 섹션 리서치 시작: {number}. {title} ===")
+    # 문자열 += 누적은 본문이 길어질수록 O(n^2) 복사가 되므로
+    # 리스트에 모았다가 join으로 1회 결합
+    chunks: list[str] = []         # 전체 본문
+    buffer_chunks: list[str] = []  # 로그 플러시용
+    buffer_len = 0
+    last_flush = time.monotonic()
+
+    # 하위 섹션 정보 구성 (기존 로직 유지)
+    subsection_structure = ""
+    if subsections:
+        subsection_structure = "\n\n하위 섹션들:\n"
+        for sub in subsections:
+            sub_number = sub.get("number", "")
+            sub_title = sub.get("title", "")
+            subsection_structure += f"- {sub_number}. {sub_title}\n"
+
+    # 적당한 수준의 상세 프롬프트
+    # 고정 지침을 앞에, 섹션/컨텍스트 등 가변 입력을 맨 뒤에 배치
+    # (섹션마다 동일한 긴 접두사가 OpenAI 프롬프트 캐시에 적중하도록)
+    combined_prompt = _SECTION_PROMPT_TEMPLATE.format(
+        number=number,
+        title=title,
+        subsection_structure=subsection_structure,
+        previous_outputs=previous_outputs,
+        previous_feedback=previous_feedback,
+    ).strip()
 
     # 스트리밍 요청
     stream = await client.responses.create(
@@ -152,109 +176,133 @@ async def execute_research_section(section_info: dict, topic: str = "", previous
         ],
         tools=tools,
         store=True,
-        background=False,
+        # background 모드: 서버가 응답을 보관하므로 10분 가까운 리서치 동안
+        # 연결이 끊겨도 sequence_number 기준으로 이어받을 수 있음
+        background=True,
         stream=True,
         reasoning={"summary": "auto"}
     )
 
+    def _on_item_added(evt) -> None:
+        """2) 툴 호출 시작 및 파라미터 (output_item.added)"""
+        if not (hasattr(evt, "item") and evt.item.type.endswith("_call")):
+            return
+        log(f"[{number}] 📋 툴 시작 이벤트 정보: {evt}")
+        tool_name = evt.item.type
+        params = getattr(evt.item, "action", None) or getattr(evt.item, "arguments", None)
+        log(f"[{number}] 🔧 Tool 시작 → {tool_name}, params={params}")
+
+        event_logger.emit_event(
+            event_type="tool_usage_started",
+            data={"tool_name": tool_name},
+            job_id=job_id,
+            crew_type="report",
+            todo_id=todo_id,
+            proc_inst_id=proc_inst_id
+        )
+
+    def _on_item_done(evt) -> None:
+        """3) 툴 호출 완료 및 결과 (output_item.done)"""
+        if not (hasattr(evt, "item") and evt.item.type.endswith("_call")):
+            return
+        log(f"[{number}] 📋 툴 완료 이벤트 정보: {evt}")
+        tool_name = evt.item.type
+        action = getattr(evt.item, "action", {}) or {}
+        action_type = getattr(action, "type", "")
+
+        if action_type == "search" or action_type == "search:web_search_preview":
+            value = getattr(action, "query", "")
+            verb = "검색"
+        elif action_type == "open_page":
+            value = getattr(action, "url", "")
+            verb = "접속"
+        elif action_type == "find_in_page":
+            value = getattr(action, "url", "")
+            verb = "찾기"
+        else:
+            try:
+                value = orjson.dumps(action, default=str).decode("utf-8")
+            except:
+                value = str(action)
+            verb = "실행"
+
+        info = f"{verb}: {value}"
+
+        log(f"[{number}] ✅ Tool 완료 → {tool_name}, info={info}")
+
+        # 간단한 null byte 체크 ('\u0000'과 '\x00'은 같은 문자라 한 번만 스캔)
+        if '\x00' in info:
+            log(f"[{number}] ⚠️ null byte 감지 → 이벤트 스킵")
+        else:
+            event_logger.emit_event(
+                event_type="tool_usage_finished",
+                data={
+                    "tool_name": tool_name,
+                    "info":      info
+                },
+                job_id=job_id,
+                crew_type="report",
+                todo_id=todo_id,
+                proc_inst_id=proc_inst_id
+            )
+
+    def _on_delta(evt) -> None:
+        """4) 본문 스트리밍 청크"""
+        nonlocal buffer_len, last_flush
+        # 청크별 이벤트 전체 덤프는 DEBUG에서만 (델타 핫패스의 지배적 비용)
+        if debug_enabled():
+            log(f"[{number}] 📋 본문 스트리밍 청크 이벤트 정보: {evt}")
+        # delta 이벤트에서 스트리밍된 텍스트를 직접 가져오기
+        delta = getattr(evt, "delta", "")
+        chunks.append(delta)
+        buffer_chunks.append(delta)
+        buffer_len += len(delta)
+        # 크기 조건 + 시간 조건을 함께 만족할 때만 플러시
+        now = time.monotonic()
+        if buffer_len >= CHAR_THRESHOLD and now - last_flush >= FLUSH_INTERVAL:
+            log(f"[{number}] 📄 본문 (버퍼 {CHAR_THRESHOLD}자):\n{''.join(buffer_chunks)}")
+            buffer_chunks.clear()
+            buffer_len = 0
+            last_flush = now
+
+    # 이벤트 타입별 디스패치 (90% 이상이 본문 델타이므로 if/elif 체인과
+    # hasattr 검사 대신 dict 1회 조회로 분기; 그 외 이벤트는 무시)
+    handlers = {
+        "response.output_text.delta": _on_delta,
+        "response.output_item.added": _on_item_added,
+        "response.output_item.done": _on_item_done,
+    }
+
+    response_id = None
+    last_seq = 0
+    resumes = 0
+
     try:
-        async for evt in stream:
-            et = evt.type
-
-            # # 1) 추론 파트 완료만
-            # if et == "response.reasoning_summary_part.done":
-            #     print(f"[{number}] 📋 추론 이벤트 정보: {evt}")
-            #     part = evt.part
-            #     text = getattr(part, "text", "")
-            #     print(f"[{number}] 🤔 추론 파트 완료:\n{text}\n")
-
-            #     event_logger.emit_event(
-            #         event_type="reason_done",
-            #         data={},
-            #         job_id=f"api_{job_id}",
-            #         crew_type="reason",
-            #         todo_id=todo_id,
-            #         proc_inst_id=proc_inst_id
-            #     )
-
-            # 2) 툴 호출 시작 및 파라미터 (output_item.added)
-            if et == "response.output_item.added" and hasattr(evt, "item") and evt.item.type.endswith("_call"):
-                log(f"[{number}] 📋 툴 시작 이벤트 정보: {evt}")
-                tool_name = evt.item.type
-                params = getattr(evt.item, "action", None) or getattr(evt.item, "arguments", None)
-                log(f"[{number}] 🔧 Tool 시작 → {tool_name}, params={params}")
-
-                event_logger.emit_event(
-                    event_type="tool_usage_started",
-                    data={"tool_name": tool_name},
-                    job_id=job_id,
-                    crew_type="report",
-                    todo_id=todo_id,
-                    proc_inst_id=proc_inst_id
-                )
-
-            # 3) 툴 호출 완료 및 결과 (output_item.done)
-            elif et == "response.output_item.done" and hasattr(evt, "item") and evt.item.type.endswith("_call"):
-                log(f"[{number}] 📋 툴 완료 이벤트 정보: {evt}")
-                tool_name = evt.item.type
-                # result = getattr(evt.item, "outputs", None) or getattr(evt.item, "action", None)
-                action = getattr(evt.item, "action", {}) or {}
-                action_type = getattr(action, "type", "")
-                
-                if action_type == "search" or action_type == "search:web_search_preview":
-                    value = getattr(action, "query", "")
-                    verb = "검색"
-                elif action_type == "open_page":
-                    value = getattr(action, "url", "")
-                    verb = "접속"
-                elif action_type == "find_in_page":
-                    value = getattr(action, "url", "")
-                    verb = "찾기"
-                else:
-                    try:
-                        value = json.dumps(action, ensure_ascii=False, default=str)
-                    except:
-                        value = str(action)
-                    verb = "실행"
-
-                info = f"{verb}: {value}"
-
-                log(f"[{number}] ✅ Tool 완료 → {tool_name}, info={info}")
-
-                # 간단한 null byte 체크
-                if '\u0000' in info or '\x00' in info:
-                    log(f"[{number}] ⚠️ null byte 감지 → 이벤트 스킵")
-                else:
-                    event_logger.emit_event(
-                        event_type="tool_usage_finished",
-                        data={
-                            "tool_name": tool_name,
-                            "info":      info
-                        },
-                        job_id=job_id,
-                        crew_type="report",
-                        todo_id=todo_id,
-                        proc_inst_id=proc_inst_id
-                    )
-
-            # 4) 본문 스트리밍 청크
-            elif et == "response.output_text.delta":
-                log(f"[{number}] 📋 본문 스트리밍 청크 이벤트 정보: {evt}")
-                # delta 이벤트에서 스트리밍된 텍스트를 직접 가져오기
-                delta = getattr(evt, "delta", "")
-                buffer += delta
-                full_text += delta
-                if len(buffer) >= CHAR_THRESHOLD:
-                    log(f"[{number}] 📄 본문 (버퍼 {CHAR_THRESHOLD}자):\n{buffer}")
-                    buffer = ""
-
-            # 그 외 이벤트는 무시
+        while True:
+            try:
+                async for evt in stream:
+                    last_seq = getattr(evt, "sequence_number", last_seq)
+                    if response_id is None:
+                        response_id = getattr(getattr(evt, "response", None), "id", None)
+                    handler = handlers.get(evt.type)
+                    if handler is not None:
+                        handler(evt)
+                break
+            except (openai.APIConnectionError, openai.APITimeoutError) as e:
+                # background 응답은 서버에 보관되므로 마지막 시퀀스 이후부터 이어받기
+                if response_id is None or resumes >= STREAM_RESUME_MAX:
+                    raise
+                resumes += 1
+                handle_error(f"섹션 스트림 재연결 {resumes}/{STREAM_RESUME_MAX}", e, raise_error=False, extra={"number": number, "last_seq": last_seq})
+                await stream.close()
+                stream = await client.responses.retrieve(response_id, stream=True, starting_after=last_seq)
 
         # 남은 버퍼 출력
-        if buffer:
-            log(f"[{number}] 📄 본문 (마지막):\n{buffer}")
+        if buffer_chunks:
+            log(f"[{number}] 📄 본문 (마지막):\n{''.join(buffer_chunks)}")
 
         # 최종 본문 전체 출력
+        full_text = "".join(chunks)
         log(f"[{number}] 📢 최종 결과:\n{full_text}")
         return full_text
 
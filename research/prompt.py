@@ -3,14 +3,12 @@
 프롬프트 생성 함수 모음
 """
 
-def create_execution_plan_prompt(form_types: list, user_info: list) -> str:
+def create_execution_plan_prompt(form_types: list, user_info: list | str) -> str:
+    # 고정 지침을 앞에, 가변 입력을 맨 뒤에 배치 (동일 접두사가 길수록
+    # OpenAI 프롬프트 캐시에 적중해 입력 토큰 비용/지연이 줄어듦)
     prompt = f"""
 주어진 폼 타입들을 처리하기 위한 종합적인 실행 계획을 수립하세요.
 
-입력 데이터:
-- 폼 타입들: {form_types}
-- 담당자 정보: {user_info}
-
 핵심 실행 규칙:
 1. **엄격한 단계 순서**: 리포트 → 슬라이드 → 텍스트 (단계 간 중복 처리 금지)
 2. **기존 타입만 사용**: 입력된 form_types에 실제로 존재하는 폼 타입만 계획에 포함
@@ -91,13 +89,17 @@ def create_execution_plan_prompt(form_types: list, user_info: list) -> str:
 - 입력 form_types에 실제로 존재하는 폼만 사용
 - 매칭되는 폼이 없는 단계는 빈 forms 배열 []로 반환
 
-입력된 form_types에 실제로 존재하는 폼 타입만 포함하고 정확한 타입과 매칭되는 
+입력된 form_types에 실제로 존재하는 폼 타입만 포함하고 정확한 타입과 매칭되는
 완전하고 유효한 JSON 실행 계획을 출력하세요.
 매칭되는 폼이 없는 단계는 빈 forms 배열로 설정하세요.
+
+입력 데이터:
+- 폼 타입들: {form_types}
+- 담당자 정보: {user_info}
 """
     return prompt
 
-def create_toc_prompt(previous_outputs_summary: str = "", feedback_summary: str = "", user_info: list | None = None) -> str:
+def create_toc_prompt(previous_outputs_summary: str = "", feedback_summary: str = "", user_info: list | str | None = None) -> str:
     return f"""
 당신은 전문적인 보고서 목차(TOC) 생성 전문가입니다.
 
@@ -118,11 +120,6 @@ def create_toc_prompt(previous_outputs_summary: str = "", feedback_summary: str
 5. **컨텍스트 반영**: 제공된 이전 결과물 요약과 피드백을 충분히 반영
 6. **실용성 중시**: 실제 보고서 작성에 바로 활용 가능한 구조
 
-**입력 정보:**
-- 이전 결과물 요약: {previous_outputs_summary}
-- 피드백 요약: {feedback_summary}
-- 담당자 정보: {user_info}
-
 **결과 형식 (JSON):**
 다음과 같은 예시 구조로 목차를 생성하세요 (explanation_text 포함):
 
@@ -171,18 +168,17 @@ def create_toc_prompt(previous_outputs_summary: str = "", feedback_summary: str
 - 길이: 8~15줄 내외로 간결하되 가독성 좋게 작성
 
 위 예시를 참고하여 컨텍스트 내용에 맞는 구체적이고 실용적인 목차를 JSON 형식으로 생성하세요.
-""" 
-
-
-def create_slide_generation_prompt(content: str, user_info: list, previous_outputs_summary: str = "", feedback_summary: str = "") -> str:
-    prompt = f"""
-제공된 리포트 내용과 컨텍스트를 종합 분석한 후, reveal.js 호환 마크다운 슬라이드 프레젠테이션을 완성도 높게 생성하세요.
 
-**입력 정보 (담당자):**
-- 현재 리포트/내용: {content}
+**입력 정보:**
 - 이전 결과물 요약: {previous_outputs_summary}
 - 피드백 요약: {feedback_summary}
 - 담당자 정보: {user_info}
+"""
+
+
+def create_slide_generation_prompt(content: str, user_info: list | str, previous_outputs_summary: str = "", feedback_summary: str = "") -> str:
+    prompt = f"""
+제공된 리포트 내용과 컨텍스트를 종합 분석한 후, reveal.js 호환 마크다운 슬라이드 프레젠테이션을 완성도 높게 생성하세요.
 
 **1단계: 컨텍스트 분석**
 1. **이전 결과물 문맥 파악**: previous_outputs_summary를 분석하여 이전에 무엇을 했는지, 어떤 목적과 요구사항이 있었는지 정확히 이해
@@ -237,23 +233,20 @@ def create_slide_generation_prompt(content: str, user_info: list, previous_outpu
 - reveal.js 호환 마크다운 구문 사용
 - 논리적 흐름과 전문적인 프레젠테이션 품질
 - 사용자 정보 적절히 통합
+
+**입력 정보 (담당자):**
+- 현재 리포트/내용: {content}
+- 이전 결과물 요약: {previous_outputs_summary}
+- 피드백 요약: {feedback_summary}
+- 담당자 정보: {user_info}
 """
     return prompt
 
-def create_text_form_generation_prompt(report_content: str, topic: str, text_forms: list, user_info: list, previous_outputs_summary: str = "", feedback_summary: str = "", form_html: str = "") -> str:
+def create_text_form_generation_prompt(report_content: str, topic: str, text_forms: list, user_info: list | str, previous_outputs_summary: str = "", feedback_summary: str = "", form_html: str = "") -> str:
   
     prompt = f"""
 제공된 폼 타입 정보를 기반으로 전문적이고 실용적인 값을 생성하세요.
 
-**입력 정보 (담당자 포함)**:
-- 리포트 내용 또는 이전 작업 내용: {report_content}
-- 피드백: {feedback_summary}
-- 이전 결과물: {previous_outputs_summary}
-- 워크플로우 단계: {topic}
-- 폼 타입 정보: {text_forms}
- - 폼 HTML 템플릿: {form_html}
- - 담당자 정보: {user_info}
-
 **컨텍스트 분석 단계:**
 1. **이전 결과물 문맥 파악**: previous_outputs_summary를 분석하여 이전에 무엇을 했는지, 어떤 목적과 요구사항이 있었는지 정확히 이해
 2. **피드백 우선 반영**: feedback_summary를 최우선으로 분석하여 사용자가 원하는 개선사항과 요구사항을 파악하고 이를 폼 값 생성에 적극 반영
@@ -302,14 +295,21 @@ form_type 배열의 각 폼 key를 JSON 키로 사용하는 평면 JSON 객체.
  - radio의 경우 반드시 HTML items에서 정의된 키 중 하나를 선택하여 반환 (라벨이 아닌 키)
 
 제공된 폼 타입 정보와 HTML 템플릿을 기반으로 고품질의 전문적인 값을 생성하여 완전한 JSON 객체로 출력하세요.
+
+**입력 정보 (담당자 포함)**:
+- 리포트 내용 또는 이전 작업 내용: {report_content}
+- 피드백: {feedback_summary}
+- 이전 결과물: {previous_outputs_summary}
+- 워크플로우 단계: {topic}
+- 폼 타입 정보: {text_forms}
+ - 폼 HTML 템플릿: {form_html}
+ - 담당자 정보: {user_info}
 """
     return prompt
 
 def create_output_summary_prompt(outputs_str: str) -> str:
     """이전 결과물 요약 프롬프트 - 목차, 수치 관련 지시사항 보강"""
-    return f"""다음 작업 결과를 체계적으로 정리해주세요:
-
-{outputs_str}
+    return f"""다음에 제시될 작업 결과를 체계적으로 정리해주세요.
 
 **정리 원칙:**
 - **구체적 정보 완전 보존**: 수치, 목차명, 섹션명, 인물명, 물건명, 날짜, 시간 등 객관적 정보는 반드시 원본 그대로 정확히 기록
@@ -343,7 +343,59 @@ def create_output_summary_prompt(outputs_str: str) -> str:
 
 **길이 제한**: 2000자 이내로 작성 (목차, 수치 등 핵심 정보는 유지하되 불필요한 부분만 압축)
 
-⚠️ **절대 금지사항**: 목차명, 수치, 날짜, 인명 등의 변경이나 생략 절대 금지. 모든 구체적 정보는 원본과 100% 일치해야 함."""
+⚠️ **절대 금지사항**: 목차명, 수치, 날짜, 인명 등의 변경이나 생략 절대 금지. 모든 구체적 정보는 원본과 100% 일치해야 함.
+
+=== 작업 결과 ===
+{outputs_str}"""
+
+def create_combined_summary_prompt(outputs_str: str = "", feedbacks_str: str = "", contents_str: str = "") -> str:
+    """이전 결과물 요약 + 피드백 요약을 한 번의 호출로 처리하는 통합 프롬프트
+
+    두 요약은 같은 모델로 처리되므로 요청을 하나로 합쳐 TLS/큐잉/TTFT
+    오버헤드를 절반으로 줄인다. 결과는 JSON 객체 하나로 받는다.
+    """
+    outputs_section = f"""=== 작업 결과 ===
+{outputs_str}""" if outputs_str and outputs_str.strip() else ""
+
+    feedback_section = f"""=== 피드백 내용 ===
+{feedbacks_str}""" if feedbacks_str and feedbacks_str.strip() else ""
+
+    content_section = f"""=== 현재 결과물/작업 내용 ===
+{contents_str}""" if contents_str and contents_str.strip() else ""
+
+    return f"""다음에 제시될 자료를 분석하여 두 가지 요약을 JSON 객체 하나로 작성해주세요.
+
+**출력 형식 (JSON):**
+{{
+  "output_summary": "작업 결과 정리 (자료에 '작업 결과' 섹션이 없으면 빈 문자열)",
+  "feedback_summary": "통합 피드백 (자료에 '피드백 내용'/'현재 결과물' 섹션이 없으면 빈 문자열)"
+}}
+
+**output_summary 작성 원칙 (작업 결과 정리):**
+- **구체적 정보 완전 보존**: 수치, 목차명, 섹션명, 인물명, 날짜, 시간 등 객관적 정보는 원본 그대로 정확히 기록
+- **정보 손실 방지**: 짧은 내용은 요약하지 말고 그대로 유지
+- **의미 보존**: 왜곡이나 의미 변경 절대 금지, 원본 의미 그대로 보존
+- **목차/구조 보존**: 목차 제목·번호 체계·계층 구조를 원본과 정확히 일치시켜 기록
+- **수치/단위 보존**: 모든 수치를 단위(%, 개, 명, 원 등)와 함께 정확히 기록
+- **통합성**: 하나의 통합된 문맥으로 작성, 2000자 이내 (핵심 정보는 유지하되 불필요한 부분만 압축)
+
+**feedback_summary 작성 원칙 (피드백 통합):**
+- **시간 흐름 이해**: 가장 최신 피드백을 최우선으로 반영
+- **종합적 분석**: 결과물과 피드백을 함께 고려하여 핵심 문제점과 개선사항 도출
+- **구체성 확보**: 추상적 지시가 아닌 구체적이고 실행 가능한 개선사항 제시
+- **완전성 추구**: 다음 작업자가 이 피드백만 보고도 즉시 정확한 작업을 수행할 수 있도록 작성
+- **분량**: 최대 2500자까지 허용하여 상세히 작성
+
+**필수 준수사항:**
+- 유효한 JSON 객체 하나만 출력 (코드블록 금지)
+- 해당 입력 자료가 없는 필드는 빈 문자열 ""로 설정
+
+{outputs_section}
+
+{feedback_section}
+
+{content_section}"""
+
 
 def create_feedback_summary_prompt(feedbacks_str: str, contents_str: str = "") -> str:
     """피드백 정리 프롬프트 - 기존 프롬프트를 참고하여 보강"""
@@ -355,11 +407,7 @@ def create_feedback_summary_prompt(feedbacks_str: str, contents_str: str = "") -
     content_section = f"""=== 현재 결과물/작업 내용 ===
 {contents_str}""" if contents_str and contents_str.strip() else ""
     
-    return f"""다음은 사용자의 피드백과 결과물입니다. 이를 종합 분석하여 통합된 피드백을 작성해주세요:
-
-{feedback_section}
-
-{content_section}
+    return f"""다음에 제시될 사용자의 피드백과 결과물을 종합 분석하여 통합된 피드백을 작성해주세요.
 
 **상황 분석 및 처리 방식:**
 - **현재 결과물 품질 평가**: 어떤 점이 문제인지, 개선이 필요한지 구체적으로 판단
@@ -384,4 +432,8 @@ def create_feedback_summary_prompt(feedbacks_str: str, contents_str: str = "") -
 - **전면 재작업**: 완전히 다시 시작해야 하는 경우 → 새로운 접근 방향 제시
 
 **출력 형식**: 현재 상황을 종합적으로 분석한 완전한 피드백 문장 (최대 2500자까지 허용하여 상세히 작성)
-**목표**: 다음 작업자가 이 피드백만 보고도 즉시 정확한 작업을 수행할 수 있도록 하는 것"""
\ No newline at end of file
+**목표**: 다음 작업자가 이 피드백만 보고도 즉시 정확한 작업을 수행할 수 있도록 하는 것
+
+{feedback_section}
+
+{content_section}"""
\ No newline at end of file
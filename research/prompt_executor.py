@@ -1,8 +1,13 @@
-from openai import OpenAI, AsyncOpenAI
+from openai import AsyncOpenAI, APIConnectionError, APITimeoutError, RateLimitError
+import hashlib
 import json
+import orjson
+import os
+from functools import lru_cache
 import asyncio
 import logging
 import random
+import threading
 import time
 from typing import Any, Callable
 from utils.logger import handle_error, log
@@ -11,8 +16,7 @@ from .prompt import (
     create_slide_generation_prompt,
     create_text_form_generation_prompt,
     create_toc_prompt,
-    create_output_summary_prompt,
-    create_feedback_summary_prompt
+    create_combined_summary_prompt,
 )
 
 # ============================================================================
@@ -22,114 +26,205 @@ from .prompt import (
 logger = logging.getLogger(__name__)
 
 # ============================================================================
-# 동기 함수들 - 기존 호환성 유지
+# OpenAI 클라이언트 재사용
 # ============================================================================
 
-def generate_execution_plan(form_types: list, user_info: list, openai_api_key: str, model: str = "gpt-4o-mini") -> str:
+# 호출마다 클라이언트(및 내부 httpx 커넥션 풀)를 새로 만들지 않도록 키별로 캐시
+@lru_cache(maxsize=4)
+def _get_async_client(api_key: str) -> AsyncOpenAI:
+    return AsyncOpenAI(api_key=api_key)
+
+# 동시 OpenAI 호출 수 상한 (폼/섹션 팬아웃이 RPM 한도를 넘겨 재시도 폭주로
+# 오히려 느려지는 것을 방지하는 선제 스로틀)
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "16"))
+_openai_sem = asyncio.Semaphore(OPENAI_MAX_CONCURRENCY)
+
+# 재시도할 가치가 있는 일시적 오류만 (BadRequest 등 비일시적 오류는 즉시 전파)
+_RETRYABLE_ERRORS = (RateLimitError, APITimeoutError, APIConnectionError)
+
+
+async def _with_retry(fn: Callable[[], Any], task_name: str, model: str, *, retries: int = 3, base_delay: float = 0.8) -> str:
+    """세마포어 게이트 + 지수 백오프 재시도 공통 래퍼
+
+    일시적 오류(_RETRYABLE_ERRORS)만 재시도하고, 요청 자체가 잘못된
+    오류는 백오프로 시간을 태우지 않고 바로 실패 처리한다.
+    """
+    last_error: Exception | None = None
+    for attempt in range(1, retries + 1):
+        try:
+            async with _openai_sem:
+                return await fn()
+        except _RETRYABLE_ERRORS as e:
+            last_error = e
+            jitter = random.uniform(0, 0.3)
+            delay = base_delay * (2 ** (attempt - 1)) + jitter
+            handle_error(f"{task_name} OpenAI 재시도 {attempt}/{retries}", e, raise_error=False, extra={"delay": round(delay, 2), "model": model})
+            await asyncio.sleep(delay)
+        except Exception as e:
+            handle_error(f"{task_name} OpenAI 호출실패", e, raise_error=True, extra={"model": model})
+    handle_error(f"{task_name} OpenAI 최종실패", last_error or Exception("unknown"), raise_error=True)
+    return ""
+
+# ============================================================================
+# 프롬프트 응답 캐시
+# ============================================================================
+
+# 동일 입력으로 재호출되는 LLM 요청(실행계획/TOC 등)의 왕복을 생략하기 위한
+# 프로세스 내 정확 일치 캐시 (프롬프트 해시 → 응답, TTL 만료)
+# 폴링 주기로 같은 프로세스 인스턴스를 반복 처리하는 배포에서는 TTL을 늘리면 적중률이 올라감
+PROMPT_CACHE_TTL = float(os.getenv("PROMPT_CACHE_TTL", "300"))   # 초
+PROMPT_CACHE_MAX = int(os.getenv("PROMPT_CACHE_MAX", "256"))     # 항목 수 상한
+
+_prompt_cache: dict[str, tuple[float, str]] = {}
+_prompt_cache_lock = threading.Lock()
+
+
+def _prompt_cache_key(kind: str, model: str, prompt: str) -> str:
+    """호출 종류/모델/프롬프트 전문을 해시한 캐시 키"""
+    return hashlib.sha256(f"{kind}|{model}|{prompt}".encode("utf-8")).hexdigest()
+
+
+def _canonical_plan_cache_key(form_types: list, user_info: list | str, model: str) -> str:
+    """실행계획용 정규화 캐시 키
+
+    같은 폼 구성이라도 form_types의 항목 순서나 딕셔너리 키 순서가 달라지면
+    프롬프트 문자열이 달라져 캐시를 놓치므로, key 기준 정렬 + 키 정렬 직렬화로
+    동일 구성은 항상 같은 키에 적중하도록 한다.
+    """
+    try:
+        ordered = sorted(form_types, key=lambda f: str(f.get("key", "")))
+        payload = json.dumps([ordered, user_info], sort_keys=True, ensure_ascii=False)
+    except Exception:
+        # 직렬화 불가능한 입력이면 프롬프트 전문 해시로 동작 (기존 방식)
+        payload = str(form_types) + str(user_info)
+    return hashlib.sha256(f"plan|{model}|{payload}".encode("utf-8")).hexdigest()
+
+
+def _prompt_cache_get(key: str) -> str | None:
+    now = time.monotonic()
+    with _prompt_cache_lock:
+        entry = _prompt_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < now:
+            del _prompt_cache[key]
+            return None
+        return value
+
+
+def _prompt_cache_put(key: str, value: str) -> None:
+    now = time.monotonic()
+    with _prompt_cache_lock:
+        if len(_prompt_cache) >= PROMPT_CACHE_MAX:
+            # 만료 항목 우선 제거, 그래도 가득이면 가장 오래된 항목 제거
+            expired = [k for k, (exp, _) in _prompt_cache.items() if exp < now]
+            for k in expired:
+                del _prompt_cache[k]
+            if len(_prompt_cache) >= PROMPT_CACHE_MAX:
+                oldest = min(_prompt_cache, key=lambda k: _prompt_cache[k][0])
+                del _prompt_cache[oldest]
+        _prompt_cache[key] = (now + PROMPT_CACHE_TTL, value)
+
+# ============================================================================
+# 비동기 생성 함수들
+# ============================================================================
+
+async def generate_execution_plan(form_types: list, user_info: list | str, openai_api_key: str, model: str = "gpt-4o-mini") -> str:
     prompt = create_execution_plan_prompt(form_types, user_info)
-    client = OpenAI(api_key=openai_api_key)
+    cache_key = _canonical_plan_cache_key(form_types, user_info, model)
+    cached = _prompt_cache_get(cache_key)
+    if cached is not None:
+        log("실행계획 캐시 적중 - LLM 호출 생략")
+        return cached
+    client = _get_async_client(openai_api_key)
 
-    def _once() -> str:
-        response = client.chat.completions.create(
+    async def _once() -> str:
+        response = await client.chat.completions.create(
             model=model,
             messages=[{"role": "user", "content": prompt}],
-            temperature=0.1
+            temperature=0.1,
+            # 코드블록 없는 순수 JSON을 강제해 clean_json_response의 정리 경로를 생략
+            response_format={"type": "json_object"},
         )
         return response.choices[0].message.content.strip()
 
-    last_error: Exception | None = None
-    for attempt in range(1, 4):
-        try:
-            return _once()
-        except Exception as e:
-            last_error = e
-            jitter = random.uniform(0, 0.3)
-            delay = 0.8 * (2 ** (attempt - 1)) + jitter
-            handle_error(f"실행계획 OpenAI 재시도 {attempt}/3", e, raise_error=False, extra={"delay": round(delay, 2), "model": model})
-            time.sleep(delay)
-    handle_error("실행계획 OpenAI 최종실패", last_error or Exception("unknown"), raise_error=True)
-    return '{"execution_plan": {"report_phase": {"forms": []}, "slide_phase": {"forms": []}, "text_phase": {"forms": []}}}'
+    result = await _with_retry(_once, "실행계획", model)
+    _prompt_cache_put(cache_key, result)
+    return result
 
 
-def generate_slide_from_report(report_content: str, user_info: list, openai_api_key: str, model: str = "gpt-4o-mini", previous_outputs_summary: str = "", feedback_summary: str = "") -> str:
+async def generate_slide_from_report(report_content: str, user_info: list | str, openai_api_key: str, model: str = "gpt-4o-mini", previous_outputs_summary: str = "", feedback_summary: str = "") -> str:
     prompt = create_slide_generation_prompt(report_content, user_info, previous_outputs_summary, feedback_summary)
-    client = OpenAI(api_key=openai_api_key)
+    cache_key = _prompt_cache_key("slide", model, prompt)
+    cached = _prompt_cache_get(cache_key)
+    if cached is not None:
+        log("슬라이드 캐시 적중 - LLM 호출 생략")
+        return cached
+    client = _get_async_client(openai_api_key)
 
-    def _once() -> str:
-        response = client.chat.completions.create(
+    async def _once() -> str:
+        response = await client.chat.completions.create(
             model=model,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.1
         )
         return response.choices[0].message.content.strip()
 
-    last_error: Exception | None = None
-    for attempt in range(1, 4):
-        try:
-            return _once()
-        except Exception as e:
-            last_error = e
-            jitter = random.uniform(0, 0.3)
-            delay = 0.8 * (2 ** (attempt - 1)) + jitter
-            handle_error(f"슬라이드 OpenAI 재시도 {attempt}/3", e, raise_error=False, extra={"delay": round(delay, 2), "model": model})
-            time.sleep(delay)
-    handle_error("슬라이드 OpenAI 최종실패", last_error or Exception("unknown"), raise_error=True)
-    return ""
+    result = await _with_retry(_once, "슬라이드", model)
+    _prompt_cache_put(cache_key, result)
+    return result
 
 
-def generate_text_form_values(report_content: str, topic: str, text_forms: list, user_info: list, openai_api_key: str, model: str = "gpt-4o-mini", previous_outputs_summary: str = "", feedback_summary: str = "", form_html: str = "") -> str:
+async def generate_text_form_values(report_content: str, topic: str, text_forms: list, user_info: list | str, openai_api_key: str, model: str = "gpt-4o-mini", previous_outputs_summary: str = "", feedback_summary: str = "", form_html: str = "") -> str:
     prompt = create_text_form_generation_prompt(report_content, topic, text_forms, user_info, previous_outputs_summary, feedback_summary, form_html)
-    client = OpenAI(api_key=openai_api_key)
+    cache_key = _prompt_cache_key("text", model, prompt)
+    cached = _prompt_cache_get(cache_key)
+    if cached is not None:
+        log("텍스트폼 캐시 적중 - LLM 호출 생략")
+        return cached
+    client = _get_async_client(openai_api_key)
 
-    def _once() -> str:
-        response = client.chat.completions.create(
+    async def _once() -> str:
+        response = await client.chat.completions.create(
             model=model,
             messages=[{"role": "user", "content": prompt}],
-            temperature=0.1
+            temperature=0.1,
+            # 코드블록 없는 순수 JSON을 강제해 clean_json_response의 정리 경로를 생략
+            response_format={"type": "json_object"},
         )
         return response.choices[0].message.content.strip()
 
-    last_error: Exception | None = None
-    for attempt in range(1, 4):
-        try:
-            return _once()
-        except Exception as e:
-            last_error = e
-            jitter = random.uniform(0, 0.3)
-            delay = 0.8 * (2 ** (attempt - 1)) + jitter
-            handle_error(f"텍스트폼 OpenAI 재시도 {attempt}/3", e, raise_error=False, extra={"delay": round(delay, 2), "model": model})
-            time.sleep(delay)
-    handle_error("텍스트폼 OpenAI 최종실패", last_error or Exception("unknown"), raise_error=True)
-    return "{}"
+    result = await _with_retry(_once, "텍스트폼", model)
+    _prompt_cache_put(cache_key, result)
+    return result
 
-def generate_toc(previous_outputs_summary: str = "", feedback_summary: str = "", user_info: list | None = None, openai_api_key: str = "", model: str = "gpt-4o-mini") -> str:
+async def generate_toc(previous_outputs_summary: str = "", feedback_summary: str = "", user_info: list | str | None = None, openai_api_key: str = "", model: str = "gpt-4o-mini") -> str:
     prompt = create_toc_prompt(previous_outputs_summary, feedback_summary, user_info or [])
+    cache_key = _prompt_cache_key("toc", model, prompt)
+    cached = _prompt_cache_get(cache_key)
+    if cached is not None:
+        log("TOC 캐시 적중 - LLM 호출 생략")
+        return cached
     system_prompt = """당신은 전문 보고서 구조 설계 전문가입니다.\n\n## 핵심 역할\n- 복잡한 정보를 논리적이고 체계적인 보고서 구조로 설계\n- 독자 친화적이면서도 전문적인 목차(TOC) 생성\n- 실무에서 즉시 활용 가능한 실용적 구조 제공\n- 컨텍스트를 완벽히 이해하고 맞춤형 목차 구성\n\n## 전문성 기준\n1. **논리성**: 명확한 도입-본론-결론 구조\n2. **체계성**: 일관된 분류와 위계질서\n3. **실용성**: 실제 작성시 활용도 높은 구조\n4. **완성도**: 누락 없는 포괄적 구성\n5. **독창성**: 컨텍스트에 특화된 맞춤형 설계\n\n## 작업 방식\n- 컨텍스트 정보를 철저히 분석하여 핵심 영역 파악\n- 논리적 흐름을 고려한 순서 배치\n- 각 레벨별 적절한 분량과 깊이 조절\n- 실무 활용도를 최우선으로 고려한 구조 설계\n- 독자 편의성과 전문성의 균형 유지\n\n## 품질 기준\n⭐ 우수: 논리적 흐름이 완벽하고, 실무 활용도가 매우 높음\n⭐ 양호: 구조적 완성도는 있으나, 일부 개선 여지 존재\n⭐ 미흡: 기본 구조는 갖추었으나, 논리성이나 실용성 부족\n\n목표: 항상 ⭐ 우수 수준의 목차 생성"""
-    client = OpenAI(api_key=openai_api_key)
+    client = _get_async_client(openai_api_key)
 
-    def _once() -> str:
-        response = client.chat.completions.create(
+    async def _once() -> str:
+        response = await client.chat.completions.create(
             model=model,
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": prompt}
             ],
-            temperature=0.1
+            temperature=0.1,
+            # 코드블록 없는 순수 JSON을 강제해 clean_json_response의 정리 경로를 생략
+            response_format={"type": "json_object"},
         )
         return response.choices[0].message.content.strip()
 
-    last_error: Exception | None = None
-    for attempt in range(1, 4):
-        try:
-            return _once()
-        except Exception as e:
-            last_error = e
-            jitter = random.uniform(0, 0.3)
-            delay = 0.8 * (2 ** (attempt - 1)) + jitter
-            handle_error(f"TOC OpenAI 재시도 {attempt}/3", e, raise_error=False, extra={"delay": round(delay, 2), "model": model})
-            time.sleep(delay)
-    handle_error("TOC OpenAI 최종실패", last_error or Exception("unknown"), raise_error=True)
-    return '{"title": "", "toc": []}'
+    result = await _with_retry(_once, "TOC", model)
+    _prompt_cache_put(cache_key, result)
+    return result
 
 # ============================================================================
 # 비동기 요약 처리 함수들
@@ -138,70 +233,107 @@ def generate_toc(previous_outputs_summary: str = "", feedback_summary: str = "",
 async def summarize_async(outputs: Any, feedbacks: Any, contents: Any = None, openai_api_key: str = "", model: str = "gpt-4.1") -> tuple[str, str]:
     """LLM으로 컨텍스트 요약 - 병렬 처리로 별도 반환 (비동기)"""
     try:
-        log("요약을 위한 LLM 병렬 호출 시작")
-        
+        log("요약을 위한 LLM 통합 호출 시작")
+
         # 데이터 준비
         outputs_str = _convert_to_string(outputs)
         feedbacks_str = _convert_to_string(feedbacks) if any(item for item in (feedbacks or []) if item and item != {}) else ""
         contents_str = _convert_to_string(contents) if contents and contents != {} else ""
-        
-        # 병렬 처리
-        output_summary, feedback_summary = await _summarize_parallel(outputs_str, feedbacks_str, contents_str, openai_api_key, model)
-        
+
+        # 통합 처리 (요청 1회)
+        output_summary, feedback_summary = await _summarize_combined(outputs_str, feedbacks_str, contents_str, openai_api_key, model)
+
         log(f"이전결과 요약 완료: {len(output_summary)}자, 피드백 요약 완료: {len(feedback_summary)}자")
         return output_summary, feedback_summary
-        
+
     except Exception as e:
         handle_error("요약실패", e, raise_error=True)
         return "", ""
 
-async def _summarize_parallel(outputs_str: str, feedbacks_str: str, contents_str: str = "", openai_api_key: str = "", model: str = "gpt-4.1") -> tuple[str, str]:
-    """병렬로 요약 처리 - 별도 반환"""
-    tasks = []
-    
-    # 1. 이전 결과물 요약 태스크 (데이터가 있을 때만)
-    if outputs_str and outputs_str.strip():
-        output_prompt = create_output_summary_prompt(outputs_str)
-        tasks.append(_call_openai_api_async(output_prompt, "이전 결과물", openai_api_key, model))
-    else:
-        tasks.append(_create_empty_task(""))
-    
-    # 2. 피드백 요약 태스크 (피드백 또는 현재 결과물이 있을 때만)
-    if (feedbacks_str and feedbacks_str.strip()) or (contents_str and contents_str.strip()):
-        feedback_prompt = create_feedback_summary_prompt(feedbacks_str, contents_str)
-        tasks.append(_call_openai_api_async(feedback_prompt, "피드백", openai_api_key, model))
-    else:
-        tasks.append(_create_empty_task(""))
-    
-    # 3. 두 태스크를 동시에 실행하고 완료될 때까지 대기
-    output_summary, feedback_summary = await asyncio.gather(*tasks)
-    
-    # 4. 별도로 반환
-    return output_summary, feedback_summary
+async def _summarize_combined(outputs_str: str, feedbacks_str: str, contents_str: str = "", openai_api_key: str = "", model: str = "gpt-4.1") -> tuple[str, str]:
+    """두 요약을 한 번의 요청으로 처리 - 별도 반환
+
+    결과물 요약과 피드백 요약은 같은 모델을 쓰므로 요청을 하나로 합쳐
+    TLS/큐잉/TTFT 오버헤드를 절반으로 줄이고, JSON 객체로 두 필드를
+    한 번에 받는다.
+    """
+    need_output = bool(outputs_str and outputs_str.strip())
+    need_feedback = bool((feedbacks_str and feedbacks_str.strip()) or (contents_str and contents_str.strip()))
+    if not need_output and not need_feedback:
+        return "", ""
+
+    prompt = create_combined_summary_prompt(outputs_str if need_output else "", feedbacks_str, contents_str)
+    raw = await _call_openai_api_async(prompt, "통합요약", openai_api_key, model, json_mode=True)
+    if not raw:
+        return "", ""
+    try:
+        parsed = orjson.loads(raw)
+        return str(parsed.get("output_summary") or ""), str(parsed.get("feedback_summary") or "")
+    except orjson.JSONDecodeError as e:
+        # 파싱 실패 시 비치명 처리: 원문을 해당 요약 자리에 그대로 전달
+        handle_error("통합요약 파싱", e, raise_error=False, extra={"length": len(raw)})
+        return (raw, "") if need_output else ("", raw)
 
 # ============================================================================
 # 유틸리티 함수들
 # ============================================================================
 
-async def _create_empty_task(result: str) -> str:
-    """빈 태스크 생성 (즉시 완료)"""
-    return result
-
 def _convert_to_string(data: Any) -> str:
-    """데이터를 문자열로 변환"""
+    """데이터를 문자열로 변환 (대형 결과물/피드백 직렬화는 orjson으로)"""
     if isinstance(data, str):
         return data
-    return json.dumps(data, ensure_ascii=False)
+    return orjson.dumps(data, default=str).decode("utf-8")
 
 # ============================================================================
 # OpenAI API 호출 함수들
 # ============================================================================
 
-async def _call_openai_api_async(prompt: str, task_name: str, openai_api_key: str, model: str = "gpt-4o-mini") -> str:
-    """OpenAI API 호출 (지수 백오프 재시도, 타임아웃, 비치명)"""
-    client = AsyncOpenAI(api_key=openai_api_key)
+# 진행 중인 동일 프롬프트 요청 병합용 (캐시 키 → 실행 중 태스크)
+# 여러 섹션이 같은 이전 결과물/피드백으로 동시에 요약을 요청하면
+# 실제 API 호출은 한 번만 하고 나머지는 같은 결과를 기다린다
+_inflight: dict[str, "asyncio.Task[str]"] = {}
+
+
+async def _call_openai_api_async(prompt: str, task_name: str, openai_api_key: str, model: str = "gpt-4o-mini", json_mode: bool = False) -> str:
+    """OpenAI API 호출 (캐시/단일 비행 병합 + 지수 백오프 재시도, 비치명)"""
+    cache_key = _prompt_cache_key(f"summary:{task_name}", model, prompt)
+    cached = _prompt_cache_get(cache_key)
+    if cached is not None:
+        log(f"{task_name} 요약 캐시 적중 - LLM 호출 생략")
+        return cached
+
+    inflight = _inflight.get(cache_key)
+    if inflight is None:
+        inflight = asyncio.create_task(_request_openai(prompt, task_name, openai_api_key, model, json_mode, cache_key))
+        _inflight[cache_key] = inflight
+        inflight.add_done_callback(lambda _t: _inflight.pop(cache_key, None))
+    else:
+        log(f"{task_name} 동일 프롬프트 요청 진행 중 - 기존 호출 결과 공유")
+    # 대기자 하나가 취소돼도 공유 중인 실제 호출은 계속되도록 shield
+    return await asyncio.shield(inflight)
+
+
+async def _request_openai(prompt: str, task_name: str, openai_api_key: str, model: str, json_mode: bool, cache_key: str) -> str:
+    client = _get_async_client(openai_api_key)
+
+    if task_name == "통합요약":
+            system_prompt = """당신은 작업 결과물 정리와 피드백 분석을 함께 수행하는 전문가입니다.
+
+핵심 사명:
+- **정보 손실 방지**: 수치, 목차, 인물명, 날짜 등 객관적 정보는 원본 그대로 보존하고, 짧은 내용은 요약하지 말 것
+- **의미 보존 최우선**: 왜곡이나 의미 변경 절대 금지
+- **최신 피드백 최우선**: 시간 흐름을 파악하여 가장 최신 피드백을 최우선으로 반영
+- **진짜 의도 파악**: 표면적 피드백이 아닌 진짜 의도와 숨은 요구사항을 정확히 파악
+- **실행 가능성**: 추상적 지시가 아닌 구체적이고 실행 가능한 개선사항 제시
+
+작업 원칙:
+1. **정확성**: 원본 정보를 왜곡 없이 그대로 기록
+2. **통합성**: 각 요약은 하나의 통합된 문맥으로 작성
+3. **완전성**: 다음 작업자가 요약만 보고도 즉시 정확한 작업을 수행할 수 있도록
+4. **형식 준수**: 지시된 JSON 객체 형식 외의 출력 금지
 
-    if task_name == "피드백":
+목표: 결과물 정리와 통합 피드백을 각각 완전한 품질로, 한 번에 제공"""
+    elif task_name == "피드백":
             system_prompt = """당신은 피드백 분석 및 통합 전문가입니다.
 
 핵심 사명:
@@ -258,24 +390,13 @@ async def _call_openai_api_async(prompt: str, task_name: str, openai_api_key: st
             ],
             temperature=0.1,
             timeout=30.0,
+            # json_mode면 코드블록 없는 순수 JSON을 강제
+            **({"response_format": {"type": "json_object"}} if json_mode else {}),
         )
         return response.choices[0].message.content.strip()
 
-    async def _retry(fn: Callable[[], Any], *, retries: int = 3, base_delay: float = 0.8) -> str:
-        last_error: Exception | None = None
-        for attempt in range(1, retries + 1):
-            try:
-                return await fn()
-            except Exception as e:
-                last_error = e
-                jitter = random.uniform(0, 0.3)
-                delay = base_delay * (2 ** (attempt - 1)) + jitter
-                handle_error(f"{task_name} OpenAI 재시도 {attempt}/{retries}", e, raise_error=False, extra={"delay": round(delay, 2), "model": model})
-                await asyncio.sleep(delay)
-        handle_error(f"{task_name} OpenAI 최종실패", last_error or Exception("unknown"), raise_error=True)
-        return ""
-
-    result = await _retry(_once)
+    result = await _with_retry(_once, task_name, model)
     if result:
+        _prompt_cache_put(cache_key, result)
         log(f"{task_name} 요약 완료: {len(result)}자")
     return result
\ No newline at end of file
@@ -1,8 +1,66 @@
+import json
 import os
-from dotenv import load_dotenv
+import pytest_asyncio
+from utils.env import load_env
+
+# 두 테스트가 공유하는 실제 todolist 행
+TEST_TODO_ID = "529a7104-978c-4953-ae88-6deb9b8d3fa5"
+
+# 로컬 픽스처 캐시 (있으면 Supabase 왕복 생략, 최초 조회 시 생성)
+_FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+_FIXTURE_PATH = os.path.join(_FIXTURE_DIR, f"todo_{TEST_TODO_ID.split('-')[0]}.json")
 
 def pytest_configure():
     # test 환경으로 강제 설정
     os.environ['ENV'] = 'test'
-    # .env.test 로드(override=True 로 덮어쓰기)
-    load_dotenv('.env.test', override=True)
\ No newline at end of file
+    # .env.test 로드(override=True 로 덮어쓰기, 프로세스당 1회)
+    load_env('.env.test', override=True)
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session", autouse=True)
+async def _db_setup():
+    """DB 초기화를 수집(collect) 시점이 아닌 테스트 실행 시점으로 지연
+
+    모듈 최상단 initialize_db()는 --collect-only 만으로도 DB 설정 비용을
+    지불하게 되므로, 세션 픽스처로 옮겨 모든 테스트가 초기화된 DB를 본다.
+    """
+    from core.database import initialize_db
+    initialize_db()
+    yield
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def todo_row():
+    """todolist 행을 세션당 1회만 조회해 테스트 간 공유
+
+    로컬 픽스처 파일이 있으면 DB 왕복 없이 재사용한다 (오프라인 실행 가능).
+    최신 행으로 갱신하려면 tests/fixtures/의 해당 파일을 지우면 된다.
+    """
+    if os.path.exists(_FIXTURE_PATH):
+        with open(_FIXTURE_PATH, encoding="utf-8") as f:
+            return json.load(f)
+
+    from core.database import get_db_client
+    client = get_db_client()
+    resp = (
+        client
+        .table('todolist')
+        .select('*')
+        .eq('id', TEST_TODO_ID)
+        .single()
+        .execute()
+    )
+    assert resp.data, f"Todo ID {TEST_TODO_ID}가 DB에 없습니다"
+
+    # 최초 조회 시 픽스처로 저장해 이후 실행의 원격 의존 제거
+    os.makedirs(_FIXTURE_DIR, exist_ok=True)
+    with open(_FIXTURE_PATH, "w", encoding="utf-8") as f:
+        json.dump(resp.data, f, ensure_ascii=False, indent=2)
+    return resp.data
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def prepared_inputs(todo_row):
+    """_prepare_task_inputs 결과를 세션당 1회만 계산해 공유"""
+    from core.polling_manager import _prepare_task_inputs
+    return await _prepare_task_inputs(todo_row)
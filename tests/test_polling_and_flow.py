@@ -1,50 +1,32 @@
-import os
+import asyncio
 import pytest
-from dotenv import load_dotenv
 
-# 테스트 환경 설정
-os.environ['ENV'] = 'test'
-load_dotenv('.env.test', override=True)
-
-from core.database import initialize_db, get_db_client
-from core.polling_manager import _prepare_task_inputs
+# 테스트 환경 설정(.env.test 로드)은 conftest.pytest_configure가
+# 모듈 임포트 전에 1회 수행한다
 from flows.multi_format_flow import PromptMultiFormatFlow
 
-# DB 초기화
-initialize_db()
-
 # ============================================================================
 # 테스트 케이스들
 # ============================================================================
 
 @pytest.mark.asyncio
-async def test_prepare_phase():
+async def test_prepare_phase(todo_row, prepared_inputs):
     """
     1) todolist 테이블에서 실제 todo_id로 row를 가져와,
     2) _prepare_task_inputs가 올바른 dict 구조를 반환하는지 검증
+    (row 조회와 _prepare_task_inputs는 세션 픽스처에서 1회만 수행)
     """
-    todo_id = "529a7104-978c-4953-ae88-6deb9b8d3fa5"
-    client = get_db_client()
-    resp = (
-        client
-        .table('todolist')
-        .select('*')
-        .eq('id', todo_id)
-        .single()
-        .execute()
-    )
-    row = resp.data
-    assert row, f"Todo ID {todo_id}가 DB에 없습니다"
-    
+    row = todo_row
+
     # Row 입력 확인
     print(f"\n입력 Row:")
     print(f"  activity_name: '{row.get('activity_name')}'")
     print(f"  tool: '{row.get('tool')}'")
     print(f"  user_id: '{row.get('user_id')}'")
     print(f"  tenant_id: '{row.get('tenant_id')}'")
-    
-    # _prepare_task_inputs 실행 및 결과 검증
-    inputs = await _prepare_task_inputs(row)
+
+    # _prepare_task_inputs 결과 검증
+    inputs = prepared_inputs
     print(f"\n결과 검증:")
     
     problems = []
@@ -80,25 +62,20 @@ async def test_prepare_phase():
     print(f"✓ 모든 검증 통과")
 
 @pytest.mark.asyncio
-async def test_full_flow_phase():
+async def test_full_flow_phase(prepared_inputs):
     """
     PromptMultiFormatFlow 전체 실행 흐름 테스트
+    (row 조회/입력 준비는 세션 픽스처를 재사용)
     """
-    todo_id = "529a7104-978c-4953-ae88-6deb9b8d3fa5"
-    client = get_db_client()
-    row = (
-        client
-        .table('todolist')
-        .select('*')
-        .eq('id', todo_id)
-        .single()
-        .execute()
-    ).data
-    inputs = await _prepare_task_inputs(row)
+    inputs = prepared_inputs
 
     flow = PromptMultiFormatFlow()
-    for k, v in inputs.items():
-        setattr(flow.state, k, v)
+    # 운영 경로(worker.main_async)와 동일한 방식으로 상태 주입
+    try:
+        flow.state.__dict__.update(inputs)
+    except AttributeError:
+        for k, v in inputs.items():
+            setattr(flow.state, k, v)
 
     print(f"\n플로우 단계별 실행:")
     problems = []
@@ -127,8 +104,9 @@ async def test_full_flow_phase():
     if should_have_reports and not reports:
         problems.append("reports 없음 (실행계획에는 있음)")
 
-    # 3. generate_slides (실행계획에 따라 검증)
-    slides = await flow.generate_slides()
+    # 3+4. generate_slides / generate_texts (운영 플로우와 동일하게 병렬 실행)
+    slides, texts = await asyncio.gather(flow.generate_slides(), flow.generate_texts())
+
     should_have_slides = len(slide_forms) > 0
     has_slides = isinstance(slides, dict) and (bool(slides) if should_have_slides else True)
     status = "✓" if has_slides else "❌"
@@ -136,8 +114,6 @@ async def test_full_flow_phase():
     if should_have_slides and not slides:
         problems.append("slides 없음 (실행계획에는 있음)")
 
-    # 4. generate_texts (실행계획에 따라 검증)
-    texts = await flow.generate_texts()
     should_have_texts = len(text_forms) > 0
     has_texts = isinstance(texts, dict) and (bool(texts) if should_have_texts else True)
     status = "✓" if has_texts else "❌"
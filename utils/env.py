@@ -0,0 +1,20 @@
+from typing import Optional
+
+from dotenv import load_dotenv
+
+# ============================================================================
+# .env 1회 로드
+# ============================================================================
+
+# 모듈마다 load_dotenv()를 부르면 import 순서에 따라 같은 .env 파일을
+# 여러 번 열어 파싱한다. 프로세스당 한 번만 파싱하도록 센티널로 가드.
+_loaded = False
+
+
+def load_env(path: Optional[str] = None, override: bool = False) -> None:
+    """프로세스당 한 번만 .env를 파싱해 os.environ에 반영"""
+    global _loaded
+    if _loaded:
+        return
+    load_dotenv(path, override=override)
+    _loaded = True
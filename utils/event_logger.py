@@ -1,58 +1,197 @@
 import os
-import uuid
-import json
-from datetime import datetime, timezone
-from typing import Any, Dict
+import orjson
+import time
+import atexit
+import asyncio
+import itertools
+from typing import Any, Dict, List, Optional
 import logging
 
-from dotenv import load_dotenv
-from core.database import initialize_db, get_db_client
+from core.database import initialize_db, get_db_client, _rest_insert, _rest_rpc
+from utils.env import load_env
 from utils.logger import handle_error, log
 
-load_dotenv()
+load_env()
 logger = logging.getLogger(__name__)
 
+# ============================================================================
+# 배치 플러시 설정
+# ============================================================================
+BATCH_MAX = 500        # 한 번의 insert로 보내는 최대 행 수
+FLUSH_INTERVAL = 1.0   # 시간 기반 플러시 주기 (초)
+QUEUE_MAX = 10_000     # 큐 상한 (초과 시 단건 insert로 폴백)
+
+
+# ============================================================================
+# 시간 정렬형 이벤트 ID (ULID 계열)
+# ============================================================================
+# uuid4()는 호출마다 os.urandom(16) 시스콜을 유발한다. 프로세스당 1회 시드한
+# 80비트 난수 + 카운터에 48비트 ms 타임스탬프를 붙여 시스콜 없이 ID를 만든다.
+# 시간순 단조 증가라 events B-tree 삽입 지역성도 좋아진다 (페이지 분할 감소).
+_ULID_RAND_MASK = (1 << 80) - 1
+_ulid_seed = int.from_bytes(os.urandom(10), "big")
+_ulid_counter = itertools.count()
+
+
+def _new_event_id() -> str:
+    """128비트 시간 정렬형 ID를 uuid4().hex와 같은 32자 hex로 반환"""
+    ts = int(time.time() * 1000) & ((1 << 48) - 1)
+    rand = (_ulid_seed + next(_ulid_counter)) & _ULID_RAND_MASK
+    return f"{(ts << 80) | rand:032x}"
+
+
+def _utc_iso() -> str:
+    """UTC ISO8601 타임스탬프 (datetime.now().isoformat()보다 저렴한 time 기반, utils.logger._ts와 동일 방식)"""
+    now = time.time()
+    return f"{time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(now))}.{int((now % 1) * 1e6):06d}+00:00"
+
 
 class EventLogger:
-    """Supabase 이벤트 로깅 시스템"""
+    """Supabase 이벤트 로깅 시스템 (배치 insert)"""
+
+    # NUL 문자 삭제용 변환 테이블 (C 레벨 단일 패스)
+    _NUL_TABLE = str.maketrans('', '', '\x00')
 
     def __init__(self):
         """이벤트 로거 초기화 및 DB 연결 보장"""
         try:
             initialize_db()
+            # 동기 insert 폴백 경로에서도 매번 조회하지 않도록 클라이언트를 보관
+            # (keep-alive 풀이 설정된 공유 클라이언트라 TLS 핸드셰이크 재사용)
+            self._db = get_db_client()
+            self._queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_MAX)
+            self._flush_task: Optional[asyncio.Task] = None
+            # 프로세스 종료 시 큐에 남은 이벤트 플러시
+            atexit.register(self._flush_remaining)
             logger.info("🎯 Event Logger 초기화 완료")
         except Exception as e:
             handle_error("EventLogger초기화", e, raise_error=True)
 
     def _sanitize_data(self, data: Any) -> Any:
-        """NULL 문자 제거 및 데이터 정리"""
+        """NULL 문자 제거 및 데이터 정리 (NUL이 없는 일반 경로는 원본 그대로 반환)"""
+        # JSON 규격상 제어문자는 \u0000 이스케이프로 직렬화되므로 직렬화본만 한 번 스캔
+        # (orjson은 stdlib json.dumps 대비 수 배 빠름 - 이벤트마다 타는 경로)
+        serialized = orjson.dumps(data, default=str)
+        if b'\\u0000' not in serialized:
+            return data
+        return self._strip_nul(data)
+
+    def _strip_nul(self, data: Any) -> Any:
+        """NUL이 확인된 페이로드만 재귀적으로 정리 (str.translate 단일 패스)"""
         if isinstance(data, str):
-            return data.replace('\u0000', '').replace('\x00', '')
+            return data.translate(self._NUL_TABLE)
         elif isinstance(data, dict):
-            return {k: self._sanitize_data(v) for k, v in data.items()}
+            return {k: self._strip_nul(v) for k, v in data.items()}
         elif isinstance(data, list):
-            return [self._sanitize_data(item) for item in data]
+            return [self._strip_nul(item) for item in data]
         else:
             return data
 
     def emit_event(self, event_type: str, data: Dict[str, Any], job_id: str = None, crew_type: str = None, todo_id: str = None, proc_inst_id: str = None) -> None:
-        """커스텀 이벤트 발행 (비치명)"""
+        """커스텀 이벤트 발행 (비치명) - 큐 적재 후 배치 insert"""
         try:
-            supabase_client = get_db_client()
             event_record = {
-                "id": str(uuid.uuid4()),
-                "job_id": job_id or str(uuid.uuid4()),
+                "id": _new_event_id(),
+                "job_id": job_id or _new_event_id(),
                 "todo_id": todo_id,
                 "proc_inst_id": proc_inst_id,
                 "event_type": event_type,
                 "crew_type": crew_type,
                 "data": self._sanitize_data(data),
-                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "timestamp": _utc_iso(),
             }
-            supabase_client.table("events").insert(event_record).execute()
+
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+
+            if loop is None:
+                # 이벤트 루프 밖(동기 컨텍스트)에서는 기존처럼 즉시 insert
+                self._insert_batch([event_record])
+            else:
+                self._ensure_flush_task()
+                try:
+                    self._queue.put_nowait(event_record)
+                except asyncio.QueueFull:
+                    # 큐가 가득 차면 유실 대신 즉시 insert
+                    self._insert_batch([event_record])
+
             job_display = (job_id or "unknown")[:8]
-            log(f"[{event_type}] [{crew_type or 'N/A'}] {job_display} → Supabase: ✅")
+            log(f"[{event_type}] [{crew_type or 'N/A'}] {job_display} → 이벤트 큐 적재: ✅")
         except Exception as e:
             handle_error("이벤트발행", e, raise_error=True, extra={"event_type": event_type, "crew_type": crew_type})
             log(f"[{event_type}] → Supabase: ❌")
 
+    # ------------------------------------------------------------------
+    # 배치 플러시 내부 구현
+    # ------------------------------------------------------------------
+
+    def _ensure_flush_task(self) -> None:
+        """백그라운드 플러시 태스크가 없으면 시작"""
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        """큐를 드레인하여 BATCH_MAX 또는 FLUSH_INTERVAL 단위로 일괄 insert"""
+        while True:
+            try:
+                record = await self._queue.get()
+                batch: List[Dict[str, Any]] = [record]
+                deadline = asyncio.get_running_loop().time() + FLUSH_INTERVAL
+                while len(batch) < BATCH_MAX:
+                    timeout = deadline - asyncio.get_running_loop().time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                # RPC 한 번으로 배치 적재 (행 단위 PostgREST insert 경로 우회,
+                # 함수 내부에서 synchronous_commit=OFF 적용) - 실패 시 일반 insert 폴백
+                try:
+                    await _rest_rpc("log_event_batch", {"records": batch})
+                except Exception as e:
+                    handle_error("이벤트RPC", e, raise_error=False, extra={"count": len(batch)})
+                    await _rest_insert("events", batch)
+                log(f"이벤트 {len(batch)}건 → Supabase: ✅")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # 플러시 실패는 비치명 - 폴링/플로우는 계속 진행
+                handle_error("이벤트플러시", e, raise_error=False)
+
+    def _insert_batch(self, records: List[Dict[str, Any]]) -> None:
+        """이벤트 레코드들을 한 번의 insert로 저장"""
+        self._db.table("events").insert(records).execute()
+        log(f"이벤트 {len(records)}건 → Supabase: ✅")
+
+    def _flush_remaining(self) -> None:
+        """프로세스 종료 시 큐에 남은 이벤트를 동기 플러시"""
+        remaining: List[Dict[str, Any]] = []
+        try:
+            while True:
+                remaining.append(self._queue.get_nowait())
+        except asyncio.QueueEmpty:
+            pass
+        if remaining:
+            try:
+                self._insert_batch(remaining)
+            except Exception as e:
+                handle_error("이벤트종료플러시", e, raise_error=False, extra={"count": len(remaining)})
+
+
+# ============================================================================
+# 공용 인스턴스
+# ============================================================================
+
+# 프로세스당 큐/플러시 태스크를 하나만 유지하기 위한 모듈 단위 싱글턴
+_event_logger: Optional[EventLogger] = None
+
+
+def get_event_logger() -> EventLogger:
+    """공용 EventLogger 반환 (최초 호출 시 지연 생성)"""
+    global _event_logger
+    if _event_logger is None:
+        _event_logger = EventLogger()
+    return _event_logger
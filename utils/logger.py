@@ -1,10 +1,21 @@
+import os
+import time
 import traceback
-from datetime import datetime
 from typing import Optional, Dict, Any
 
+# 비치명 오류의 스택 포매팅은 DEBUG 레벨에서만 수행 (frame 순회 비용 절약)
+_DEBUG_TRACE = (os.getenv("LOG_LEVEL") or "").upper() == "DEBUG"
+
+
+def debug_enabled() -> bool:
+    """장황한 디버그 로그(대형 JSON 덤프 등)를 출력할지 여부"""
+    return _DEBUG_TRACE
+
 
 def _ts() -> str:
-    return datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3] + "Z"
+    # time.strftime(gmtime)가 datetime.utcnow().strftime보다 수 배 빠름 (로그마다 호출되는 경로)
+    now = time.time()
+    return f"{time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(now))}.{int((now % 1) * 1000):03d}Z"
 
 
 def log(message: str, *, context: Optional[Dict[str, Any]] = None) -> None:
@@ -20,7 +31,8 @@ def handle_error(operation: str, error: Exception, raise_error: bool = True, ext
     print(f"{prefix} 오류: {error}", flush=True)
     if extra:
         print(f"🔎 컨텍스트: {extra}", flush=True)
-    print(f"📄 스택:\n{traceback.format_exc()}", flush=True)
+    if raise_error or _DEBUG_TRACE:
+        print(f"📄 스택:\n{traceback.format_exc()}", flush=True)
     if raise_error:
         raise Exception(f"{operation} 실패: {error}")
 